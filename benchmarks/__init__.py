@@ -0,0 +1,5 @@
+"""Benchmarks of the client. Those which need a server use the fake Kazoo
+API in tests.stub_server, which is shared with the test suite, so like the
+tests they are run from the root of a source checkout rather than against
+an installed package.
+"""
@@ -0,0 +1,140 @@
+"""Compares bytes on the wire against client CPU time with and without
+compression, for large list responses and a large request body, against
+the in-process fake Kazoo API in tests.stub_server. Run from the repository
+root with::
+
+    python -m benchmarks.compression [--output results.json] [--duration 3]
+
+As in benchmarks.stub_suite each case runs its client in a fresh
+interpreter, so the server's compression work is not counted as client CPU.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import kazoo
+from tests.stub_server import StubKazooServer
+
+ACCOUNT_ID = "0" * 32
+
+LARGE_CALLFLOW = {
+    "name": "main number",
+    "numbers": ["+1415555{0:04d}".format(index) for index in range(5000)],
+    "flow": {"module": "ring_group",
+             "data": {"endpoints": [{"id": "{0:032x}".format(index),
+                                     "endpoint_type": "device"}
+                                    for index in range(500)]}},
+}
+
+CALLS = {
+    "descendants": lambda client: client.get_account_descendants(ACCOUNT_ID),
+    "descendants_streamed": lambda client: sum(
+        1 for _ in client.get_account_descendants(ACCOUNT_ID, stream=True)),
+    "callflows": lambda client: client.get_callflows(ACCOUNT_ID),
+    "update_callflow": lambda client: client.update_callflow(
+        ACCOUNT_ID, "cf" * 16, LARGE_CALLFLOW),
+}
+
+CASES = [
+    ("descendants", "identity", None),
+    ("descendants", "gzip", None),
+    ("descendants_streamed", "identity", None),
+    ("descendants_streamed", "gzip", None),
+    ("callflows", "identity", None),
+    ("callflows", "gzip", None),
+    ("update_callflow", "identity", None),
+    ("update_callflow", "identity", 1024),
+]
+
+
+def run_case(call_name, accept_encoding, threshold, base_url, duration):
+    """Make the call repeatedly for duration seconds and return the number of
+    calls and the client CPU time per call. Meant to be run in a fresh
+    interpreter.
+    """
+    import resource
+    call = CALLS[call_name]
+    client = kazoo.Client(api_key="benchmark",
+                          accept_encoding=accept_encoding,
+                          request_compression_threshold=threshold)
+    client.BASE_URL = base_url
+    client.authenticate()
+    call(client)
+    calls = 0
+    start_usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.time()
+    while time.time() - start < duration:
+        call(client)
+        calls += 1
+    elapsed = time.time() - start
+    end_usage = resource.getrusage(resource.RUSAGE_SELF)
+    client.close()
+    cpu_seconds = (end_usage.ru_utime - start_usage.ru_utime +
+                   end_usage.ru_stime - start_usage.ru_stime)
+    return {"calls": calls + 1,
+            "ms_per_call": elapsed / calls * 1000,
+            "cpu_ms_per_call": cpu_seconds / calls * 1000}
+
+
+def measure(stub, call_name, accept_encoding, threshold, duration):
+    sent_before, received_before = stub.bytes_sent, stub.bytes_received
+    output = subprocess.check_output([
+        sys.executable, "-m", "benchmarks.compression", "--case", call_name,
+        "--accept-encoding", accept_encoding, "--threshold", str(threshold),
+        "--base-url", stub.base_url, "--duration", str(duration)])
+    result = json.loads(output)
+    # The authentication request is negligible next to the payloads
+    result["response_bytes_per_call"] = \
+        (stub.bytes_sent - sent_before) // result["calls"]
+    result["request_bytes_per_call"] = \
+        (stub.bytes_received - received_before) // result["calls"]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--duration", type=float, default=3,
+                        help="seconds to run each case for")
+    parser.add_argument("--list-size", type=int, default=5000)
+    parser.add_argument("--descendants-size", type=int, default=10000)
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--accept-encoding", help=argparse.SUPPRESS)
+    parser.add_argument("--threshold", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.case:
+        threshold = None if args.threshold == "None" else int(args.threshold)
+        print json.dumps(run_case(args.case, args.accept_encoding, threshold,
+                                  args.base_url, args.duration))
+        return
+    results = {
+        "kazoo_version": kazoo.VERSION,
+        "python_version": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "duration": args.duration,
+        "list_size": args.list_size,
+        "descendants_size": args.descendants_size,
+        "cases": [],
+    }
+    with StubKazooServer(list_size=args.list_size,
+                         descendants_size=args.descendants_size,
+                         compress_responses=True) as stub:
+        for call_name, accept_encoding, threshold in CASES:
+            result = measure(stub, call_name, accept_encoding, threshold,
+                             args.duration)
+            result.update({"call": call_name,
+                           "accept_encoding": accept_encoding,
+                           "request_compression_threshold": threshold})
+            results["cases"].append(result)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    print text
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measures the cold start cost of the client: importing kazoo and
+constructing a Client, each in a fresh interpreter. Run from the repository
+root with::
+
+    python -m benchmarks.import_time [max_import_ms]
+
+If max_import_ms is given the script exits with an error when the median
+import time exceeds it, so it can be used to catch regressions.
+"""
+import subprocess
+import sys
+
+MEASURE_SCRIPT = """
+import time
+start = time.time()
+import kazoo
+imported = time.time()
+client = kazoo.Client(api_key="benchmark")
+constructed = time.time()
+client.get_callflow
+first_method = time.time()
+print (imported - start) * 1000, (constructed - imported) * 1000, \\
+    (first_method - constructed) * 1000
+"""
+
+
+def measure(runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c",
+                                          MEASURE_SCRIPT])
+        results.append([float(value) for value in output.split()])
+    return zip(*results)
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main(runs=21):
+    import_ms, construct_ms, method_ms = measure(runs)
+    print "{0:<30} {1:8.2f} ms".format("import kazoo", median(import_ms))
+    print "{0:<30} {1:8.2f} ms".format("construct Client",
+                                       median(construct_ms))
+    print "{0:<30} {1:8.2f} ms".format("first generated method",
+                                       median(method_ms))
+    return median(import_ms)
+
+
+if __name__ == "__main__":
+    import_ms = main()
+    if len(sys.argv) > 1 and import_ms > float(sys.argv[1]):
+        sys.exit("Median import time {0:.2f}ms exceeds {1}ms".format(
+            import_ms, sys.argv[1]))
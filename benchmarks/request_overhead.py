@@ -0,0 +1,60 @@
+"""Measures the client side cost of a generated API method, without any
+network I/O, by running it against a session which returns a canned
+response. Run from the repository root with::
+
+    python -m benchmarks.request_overhead
+"""
+import timeit
+from kazoo import Client
+
+
+class CannedResponse(object):
+    status_code = 200
+    json = {"status": "success", "data": {"id": "cfid"}}
+
+
+class CannedSession(object):
+
+    def _respond(self, url, **kwargs):
+        return CannedResponse()
+
+    get = post = put = delete = _respond
+
+
+def create_client():
+    client = Client(api_key="benchmark")
+    client.auth_token = "benchmarktoken"
+    client.session = CannedSession()
+    return client
+
+
+def per_call_microseconds(func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=15))
+    return seconds / number * 1e6
+
+
+def main(number=20000):
+    client = create_client()
+    resource = client._callflow_resource
+    device_resource = client._device_resource
+    cases = [
+        ("build detail request",
+         lambda: resource.get_object_request(account_id="acct",
+                                             callflow_id="cfid")),
+        ("build extra view request",
+         lambda: device_resource.get_extra_view_request("status",
+                                                        account_id="acct")),
+        ("get_callflow call",
+         lambda: client.get_callflow("acct", "cfid")),
+        ("update_callflow call",
+         lambda: client.update_callflow("acct", "cfid", {"name": "cf"})),
+        ("get_all_devices_status call",
+         lambda: client.get_all_devices_status("acct")),
+    ]
+    for name, func in cases:
+        print "{0:<30} {1:8.2f} us/call".format(
+            name, per_call_microseconds(func, number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measures the client end to end against the in-process fake Kazoo API in
+tests.stub_server, over real HTTP on the loopback interface. Run from the
+repository root with::
+
+    python -m benchmarks.stub_suite [--output results.json] [--duration 5]
+
+The stub server runs in this process and each scenario runs its client in
+a fresh interpreter, so the reported CPU time and peak memory are those of
+the client alone. Results are written as JSON so that releases can be
+compared.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import kazoo
+from tests.stub_server import StubKazooServer
+
+ACCOUNT_ID = "0" * 32
+
+SCENARIOS = {
+    "detail": lambda client: client.get_callflow(ACCOUNT_ID, "cf" * 16),
+    "list": lambda client: client.get_callflows(ACCOUNT_ID),
+    "descendants": lambda client: client.get_account_descendants(
+        ACCOUNT_ID),
+    "descendants_streamed": lambda client: sum(
+        1 for _ in client.get_account_descendants(ACCOUNT_ID, stream=True)),
+    "descendants_raw": lambda client: client.get_account_descendants(
+        ACCOUNT_ID, raw=True).content,
+}
+
+SCENARIO_ORDER = ["detail", "list", "descendants", "descendants_streamed",
+                  "descendants_raw"]
+
+
+def run_scenario(name, base_url, duration):
+    """Call the scenario repeatedly for duration seconds and return its
+    measurements. Meant to be run in a fresh interpreter.
+    """
+    import resource
+    call = SCENARIOS[name]
+    client = kazoo.Client(api_key="benchmark")
+    client.BASE_URL = base_url
+    client.authenticate()
+    call(client)
+    baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = []
+    start_usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.time()
+    while time.time() - start < duration:
+        call_start = time.time()
+        call(client)
+        latencies.append(time.time() - call_start)
+    elapsed = time.time() - start
+    end_usage = resource.getrusage(resource.RUSAGE_SELF)
+    client.close()
+    cpu_seconds = (end_usage.ru_utime - start_usage.ru_utime +
+                   end_usage.ru_stime - start_usage.ru_stime)
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "calls_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_us_per_call": cpu_seconds / len(latencies) * 1e6,
+        "peak_rss_kb": end_usage.ru_maxrss,
+        "peak_rss_growth_kb": end_usage.ru_maxrss - baseline_rss_kb,
+    }
+
+
+def percentile(sorted_values, percent):
+    index = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def measure(name, base_url, duration):
+    output = subprocess.check_output([
+        sys.executable, "-m", "benchmarks.stub_suite", "--scenario", name,
+        "--base-url", base_url, "--duration", str(duration)])
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--duration", type=float, default=5,
+                        help="seconds to run each scenario for")
+    parser.add_argument("--list-size", type=int, default=50)
+    parser.add_argument("--descendants-size", type=int, default=10000)
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.scenario:
+        print json.dumps(run_scenario(args.scenario, args.base_url,
+                                      args.duration))
+        return
+    results = {
+        "kazoo_version": kazoo.VERSION,
+        "python_version": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "duration": args.duration,
+        "list_size": args.list_size,
+        "descendants_size": args.descendants_size,
+        "scenarios": {},
+    }
+    with StubKazooServer(list_size=args.list_size,
+                         descendants_size=args.descendants_size) as stub:
+        for name in SCENARIO_ORDER:
+            results["scenarios"][name] = measure(name, stub.base_url,
+                                                 args.duration)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+    print text
+
+
+if __name__ == "__main__":
+    main()
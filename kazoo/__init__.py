@@ -1,3 +1,3 @@
-from client import Client
+from client import Client, AsyncClient
 
 VERSION = "0.1.4"
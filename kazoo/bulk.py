@@ -0,0 +1,88 @@
+import Queue
+from kazoo import exceptions
+
+
+class BulkResult(object):
+    """The outcome for one item of a bulk call. key is the item's index in
+    the list passed to a bulk create, or the object id for a bulk update or
+    delete. response is set if the call succeeded and error otherwise.
+    """
+
+    def __init__(self, key, response=None, error=None):
+        self.key = key
+        self.response = response
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    @property
+    def field_errors(self):
+        """The field errors returned by the API if the item's data was
+        invalid, otherwise None
+        """
+        if isinstance(self.error, exceptions.KazooApiBadDataError):
+            return self.error.field_errors
+        return None
+
+    def __repr__(self):
+        if self.succeeded:
+            return "<BulkResult {0!r} succeeded>".format(self.key)
+        return "<BulkResult {0!r} failed: {1!r}>".format(self.key,
+                                                         self.error)
+
+
+class BulkReport(object):
+    """The results of a bulk call split into the items which succeeded,
+    those rejected with field errors and those which failed for another
+    reason, each in the order they completed
+    """
+
+    def __init__(self, results=()):
+        self.succeeded = []
+        self.invalid = []
+        self.failed = []
+        for result in results:
+            self.add(result)
+
+    def add(self, result):
+        if result.succeeded:
+            self.succeeded.append(result)
+        elif result.field_errors is not None:
+            self.invalid.append(result)
+        else:
+            self.failed.append(result)
+
+    @property
+    def ok(self):
+        return not (self.invalid or self.failed)
+
+    def __len__(self):
+        return len(self.succeeded) + len(self.invalid) + len(self.failed)
+
+    def __repr__(self):
+        return "<BulkReport {0} succeeded, {1} invalid, {2} failed>".format(
+            len(self.succeeded), len(self.invalid), len(self.failed))
+
+
+def iter_bulk_results(submit, keyed_args):
+    """Yield a :class:`BulkResult` for each ``(key, args)`` pair in
+    keyed_args as soon as its call completes. submit takes the args and
+    returns a :class:`kazoo.executor.Future`, it bounds how many calls run at
+    once.
+    """
+    completed = Queue.Queue()
+    pending = 0
+    for key, args in keyed_args:
+        future = submit(args)
+        future.add_done_callback(
+            lambda future, key=key: completed.put((key, future)))
+        pending += 1
+    for _ in range(pending):
+        key, future = completed.get()
+        error = future.exception()
+        if error is not None:
+            yield BulkResult(key, error=error)
+        else:
+            yield BulkResult(key, response=future.result())
@@ -0,0 +1,129 @@
+import collections
+import threading
+import time
+
+
+class ResponseCache(object):
+    """A thread safe, size bounded cache of API responses keyed by relative
+    url, evicting the least recently used entry when full.
+
+    Entries expire after ttl seconds, which can be overridden per resource
+    by passing a dictionary of resource names to ttls as resource_ttls, for
+    example ``{"callflow": 300, "account": 30}``. Cached responses are
+    shared between callers and must be treated as read only.
+
+    Expired entries are kept, until evicted, so that they can be revalidated
+    against the server using their revision instead of being refetched.
+
+    As keys do not include the server or the credentials the responses were
+    fetched with, a cache belongs to a single client and must not be shared
+    with another, which could otherwise be served documents it is not
+    allowed to see.
+    """
+
+    def __init__(self, max_size=1000, ttl=60, resource_ttls=None,
+                 clock=time.time):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.resource_ttls = resource_ttls or {}
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached response for key, or None if there is no
+        unexpired entry
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._entries[key] = entry
+            if entry[0] <= self._clock():
+                return None
+            return entry[1]
+
+    def get_stale(self, key):
+        """Return the cached response for key even if it has expired, or None
+        if it has been evicted
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return entry[1]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def get_resource_name(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return entry[2]
+
+    def set(self, key, response, resource_name=None):
+        ttl = self.resource_ttls.get(resource_name, self.ttl)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + ttl, response, resource_name)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, path, collection_path=None):
+        """Remove the entries a write to path makes stale. If the write is to
+        a resource then that is the resource's list and, for writes to a
+        single object, the object and its views.
+        """
+        prefixes = []
+        if collection_path is None:
+            prefixes.append(path)
+        elif path.startswith(collection_path + "/"):
+            object_id = path[len(collection_path) + 1:].split("/", 1)[0]
+            prefixes.append(collection_path + "/" + object_id)
+        with self._lock:
+            for key in list(self._entries):
+                if self._is_stale(key, prefixes, collection_path):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _is_stale(self, key, prefixes, collection_path):
+        if collection_path is not None and _is_under(key, collection_path,
+                                                     "?"):
+            return True
+        for prefix in prefixes:
+            if _is_under(key, prefix, "/?"):
+                return True
+        return False
+
+
+def _is_under(key, path, separators):
+    if not key.startswith(path):
+        return False
+    return len(key) == len(path) or key[len(path)] in separators
+
+
+def get_revision(response):
+    """The revision of a cached response which can be sent to the server to
+    check whether it is still current, or None if it has none
+    """
+    if not hasattr(response, "get"):
+        return None
+    revision = response.get("revision")
+    if revision in (None, "undefined"):
+        return None
+    return revision
@@ -1,9 +1,17 @@
-import json
-import requests
+import threading
+import time
 import kazoo.exceptions as exceptions
+from kazoo.bulk import BulkReport, iter_bulk_results
+from kazoo.cache import get_revision
+from kazoo.crawler import AccountCrawler
+from kazoo.endpoints import EndpointPool
+from kazoo.executor import SingleFlight, WorkerPool
+from kazoo.paging import iter_pages
 from kazoo.request_objects import KazooRequest, UsernamePasswordAuthRequest, \
     ApiKeyAuthRequest
 from kazoo.rest_resources import RestResource
+from kazoo.retry import is_retryable
+from kazoo.tracing import RequestTrace
 
 
 class RestClientMetaClass(type):
@@ -16,10 +24,12 @@ class RestClientMetaClass(type):
 
     def _add_resource_methods(cls, resource_field_name, rest_resource, dct):
         cls._generate_list_func(resource_field_name, rest_resource)
+        cls._generate_list_iter_func(resource_field_name, rest_resource)
         cls._generate_get_object_func(resource_field_name, rest_resource)
         cls._generate_delete_object_func(resource_field_name, rest_resource)
         cls._generate_update_object_func(resource_field_name, rest_resource)
         cls._generate_create_object_func(resource_field_name, rest_resource)
+        cls._generate_bulk_funcs(rest_resource)
         for view_desc in rest_resource.extra_views:
             cls._generate_extra_view_func(view_desc, resource_field_name,
                                           rest_resource)
@@ -49,6 +59,24 @@ class RestClientMetaClass(type):
             request_type='get_list_request')
         setattr(cls, func_name, func)
 
+    def _generate_list_iter_func(cls, resource_field_name, rest_resource):
+        if "list" not in rest_resource.methods:
+            return
+        func_name = rest_resource.method_names.get(
+            "iter", "iter_{0}".format(rest_resource.plural_name))
+        required_args = rest_resource.required_args
+        required_args_str = "".join(["{0},".format(argname)
+                                     for argname in required_args])
+        list_request_args = ",".join(["{0}={0}".format(argname)
+                                      for argname in required_args])
+        func_templ = ("def {0}(self, {1} page_size=50): return "
+                      "self._iter_list_request(self.{2}, page_size, "
+                      "method_name=\"{0}\", {3})")
+        func_definition = func_templ.format(func_name, required_args_str,
+                                            resource_field_name,
+                                            list_request_args)
+        setattr(cls, func_name, cls._compile_func(func_name, func_definition))
+
     def _generate_get_object_func(cls, resource_field_name, rest_resource):
         if "detail" not in rest_resource.methods:
             return
@@ -89,6 +117,35 @@ class RestClientMetaClass(type):
             requires_data=True)
         setattr(cls, func_name, func)
 
+    def _generate_bulk_funcs(cls, rest_resource):
+        # Each bulk method calls the generated single object method once per
+        # item, keyed by the item's index for creates and its id otherwise.
+        required_args = rest_resource.required_args
+        required_args_str = "".join(["{0},".format(argname)
+                                     for argname in required_args])
+        bulk_descs = [
+            ("create", "data_list",
+             "(index, ({0} data,)) for index, data in enumerate(data_list)"),
+            ("update", "updates",
+             "(object_id, ({0} object_id, data)) for object_id, data in "
+             "self._get_bulk_pairs(updates)"),
+            ("delete", "object_ids",
+             "(object_id, ({0} object_id,)) for object_id in object_ids"),
+        ]
+        for method_type, items_arg, keyed_args_templ in bulk_descs:
+            if method_type not in rest_resource.methods:
+                continue
+            func_name = rest_resource.method_names["bulk_" + method_type]
+            func_templ = ("def {0}(self, {1} {2}, max_workers=10, "
+                          "stream=False): return self._execute_bulk("
+                          "\"{3}\", [{4}], max_workers, stream)")
+            func_definition = func_templ.format(
+                func_name, required_args_str, items_arg,
+                rest_resource.method_names[method_type],
+                keyed_args_templ.format(required_args_str))
+            setattr(cls, func_name,
+                    cls._compile_func(func_name, func_definition))
+
     def _generate_extra_view_func(cls, extra_view_desc, resource_field_name,
                                   rest_resource):
         func_name = extra_view_desc["name"]
@@ -119,9 +176,8 @@ class RestClientMetaClass(type):
         required_args = list(resource_required_args)
         if requires_data:
             required_args.append("data")
-        required_args_str = ",".join(required_args)
-        if len(required_args) > 0:
-            required_args_str += ","
+        required_args_str = "".join(["{0},".format(argname)
+                                     for argname in required_args])
         get_request_args = ",".join(["{0}={0}".format(argname)
                                      for argname in required_args])
         if request_type:
@@ -132,15 +188,38 @@ class RestClientMetaClass(type):
             get_request_string = get_req_templ.format(
                 resource_field_name, extra_view_name, get_request_args)
         if requires_data:
-            func_definition = "def {0}(self, {1}): return self._execute_request({2}, data=data)".format(
+            func_definition = "def {0}(self, {1} **options): return self._execute_request({2}, method_name=\"{0}\", data=data, **options)".format(
                 func_name, required_args_str, get_request_string)
         else:
-            func_definition = "def {0}(self, {1}): return self._execute_request({2})".format(
+            func_definition = "def {0}(self, {1} **options): return self._execute_request({2}, method_name=\"{0}\", **options)".format(
                 func_name, required_args_str, get_request_string)
-        func = compile(func_definition, __file__, 'exec')
+        return cls._compile_func(func_name, func_definition)
+
+    def _compile_func(cls, func_name, func_definition):
+        return LazyGeneratedMethod(cls, func_name, func_definition)
+
+
+class LazyGeneratedMethod(object):
+    """Stands in for a generated method until it is first looked up, then
+    compiles it and replaces itself on the class. Compiling every method of
+    every resource at import time would make importing the client slow.
+    """
+
+    def __init__(self, owner, func_name, func_definition):
+        self.owner = owner
+        self.func_name = func_name
+        self.func_definition = func_definition
+
+    def __get__(self, instance, owner):
+        func = self.compile()
+        setattr(self.owner, self.func_name, func)
+        return func.__get__(instance, owner)
+
+    def compile(self):
+        code = compile(self.func_definition, __file__, 'exec')
         d = {}
-        exec func in d
-        return d[func_name]
+        exec code in d
+        return d[self.func_name]
 
 
 class Client(object):
@@ -215,9 +294,210 @@ class Client(object):
         GET /accounts/{account_id}/servers/{server_id}/deployment -> client.get_deployment(acct_id, server_id)
         GET /accounts/{account_id}/users/hotdesk -> client.get_hotdesk(acct_id)
 
+    Passing ``raw=True`` to any method returns a
+    :class:`kazoo.request_objects.RawResponse` holding the status, headers
+    and undecoded body instead, for callers which only pass the response on.
+    Errors are still raised as usual, and with ``stream=True`` as well the
+    body is left unread for the caller to read in chunks. Raw requests
+    bypass the response cache. ::
+
+        >>>response = client.get_callflow(acct_id, callflow_id, raw=True)
+        >>>response.status_code, response.headers["Content-Type"], response.content
+
+    Media audio, voicemail messages and phone number documents can be
+    transferred to and from file like objects with methods such as
+    :meth:`upload_media()` and :meth:`download_media()`. Files are sent and
+    written in blocks so large files are never held in memory, and several
+    transfers can run at once with :meth:`map()` or an :class:`AsyncClient`.
+    Downloads return a :class:`kazoo.request_objects.RawResponse` whose
+    headers give the file's Content-Type. ::
+
+        >>>with open("greeting.mp3", "rb") as audio:
+        ...    client.upload_media(acct_id, media_id, audio)
+        >>>with open("port_form.pdf", "wb") as pdf:
+        ...    client.download_phone_number_doc(acct_id, number, "port_form.pdf", pdf)
+
+    Resources which can be created, updated or deleted also have bulk
+    variants of those methods which make the calls for many objects
+    concurrently, ``max_workers`` at a time, and return a
+    :class:`kazoo.bulk.BulkReport` of the items which succeeded, were
+    rejected with field errors or failed. With ``stream=True`` they instead
+    return an iterator of each item's :class:`kazoo.bulk.BulkResult` as it
+    completes. ::
+
+        >>>report = client.create_devices(acct_id, [{"name": "desk"}, {"name": "lobby"}])
+        >>>report = client.update_devices(acct_id, {device_id: {"name": "desk"}})
+        >>>for result in client.delete_callflows(acct_id, callflow_ids, stream=True):
+        ...    print result.key, result.succeeded
+
+    Passing ``stream=True`` to any method which returns a list, for example
+    ``client.get_account_descendants(acct_id, stream=True)``, returns an
+    iterator over the elements of the response's ``data`` array instead of
+    the full response. Elements are decoded as they arrive from the socket
+    so neither the whole body nor the whole decoded list is held in memory.
+
+    If the auth token expires the client authenticates again and retries
+    the request, once, however many threads see the token expire. Passing a
+    ``token_store`` from :mod:`kazoo.token_stores` shares auth tokens
+    between clients, including clients in other processes when a
+    :class:`kazoo.token_stores.FileTokenStore` or
+    :class:`kazoo.token_stores.DbmTokenStore` is used, so that a valid token
+    is reused rather than authenticating again. ::
+
+        >>>from kazoo.token_stores import FileTokenStore
+        >>>store = FileTokenStore("/var/run/kazoo_tokens.json")
+        >>>client = kazoo.Client(api_key="sdfasdfas", token_store=store)
+
+    Failed requests can be retried by passing a
+    :class:`kazoo.retry.RetryPolicy` as ``retry_policy``, and a
+    :class:`kazoo.retry.CircuitBreaker` passed as ``circuit_breaker`` makes
+    requests fail fast with :class:`kazoo.exceptions.CircuitOpenError` while
+    the API is down. ::
+
+        >>>from kazoo.retry import RetryPolicy, CircuitBreaker
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      retry_policy=RetryPolicy({"get": 5, "post": 1}),
+        ...                      circuit_breaker=CircuitBreaker(failure_threshold=10))
+
+    Requests can be paced to stay under the API's throttling limits by
+    passing a :class:`kazoo.rate_limit.RateLimiter`, which is shared by all
+    threads using the client. ::
+
+        >>>from kazoo.rate_limit import RateLimiter
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      rate_limiter=RateLimiter(rate=20, burst=40))
+
+    GET responses can be cached by passing a
+    :class:`kazoo.cache.ResponseCache` as the ``cache`` argument. Creating,
+    updating or deleting through a resource's methods removes the affected
+    entries from the cache. ::
+
+        >>>cache = kazoo.cache.ResponseCache(max_size=5000, resource_ttls={"callflow": 300})
+        >>>client = kazoo.Client(api_key="sdfasdfas", cache=cache)
+
+    Once a cached response expires it is revalidated using its ``revision``,
+    so an unchanged document is not downloaded again. Many cached responses
+    can be revalidated at once with :meth:`revalidate_cache()`. Cached
+    responses are keyed by url alone, so a cache must only be used by one
+    client.
+
+    Large reseller hierarchies can be walked with :meth:`crawl_accounts()`,
+    which fetches each account's children concurrently and yields accounts
+    as they are found, checkpointing its progress so that an interrupted
+    crawl can be resumed.
+
+    Every list method also has an iterator variant which fetches the list a
+    page at a time using Kazoo's ``page_size`` and ``start_key`` parameters
+    and yields the individual records. The next page is requested in the
+    background while the current one is being consumed. ::
+
+        >>>for callflow in client.iter_callflows(acct_id, page_size=100):
+        ...    print callflow["id"]
+
+    Every call of an API method can be traced by passing a list of
+    ``request_hooks``. Each hook's ``before_request`` method is called with a
+    :class:`kazoo.tracing.RequestTrace` before the request is made and its
+    ``after_request`` method once it has completed, when the trace holds the
+    status, the bytes sent and received and the time spent waiting for the
+    server, reading the response and decoding it. ::
+
+        >>>from kazoo.tracing import LoggingRequestHook
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      request_hooks=[LoggingRequestHook(slow_threshold=1.0)])
+
+    Passing a :class:`kazoo.metrics.MetricsRegistry` as ``metrics`` keeps
+    latency histograms, error and retry counts and in flight gauges for each
+    method, which can be exported for Prometheus. ::
+
+        >>>from kazoo.metrics import MetricsRegistry
+        >>>client = kazoo.Client(api_key="sdfasdfas", metrics=MetricsRegistry())
+        >>>client.metrics.percentile("get_callflow", 99)
+        >>>client.metrics.to_prometheus()
+
+    Responses are downloaded gzip or deflate compressed whenever the server
+    supports it, and decompressed as they are read, including when
+    streamed. Pass ``accept_encoding="identity"`` to turn this off, where
+    bandwidth is cheaper than CPU. Large request bodies can also be gzip
+    compressed, for servers which accept that, by passing
+    ``request_compression_threshold``, the size in bytes of the smallest
+    body to compress. ::
+
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      request_compression_threshold=64 * 1024)
+
+    Request data is encoded with the json module and responses are decoded
+    by requests, which uses simplejson if it is installed. To use a faster
+    JSON library such as ujson pass a :class:`kazoo.json_codecs.JsonCodec`
+    as ``json_codec``; :func:`kazoo.json_codecs.get_codec()` returns one for
+    the fastest library installed. Libraries differ from the json module in
+    some edge cases, ujson for instance rejects integers over 64 bits, so
+    this is not the default. ::
+
+        >>>from kazoo.json_codecs import get_codec
+        >>>client = kazoo.Client(api_key="sdfasdfas", json_codec=get_codec())
+
+    Requests go to ``BASE_URL``, unless a list of ``base_urls`` for the
+    nodes of a cluster is given, in which case each request, and each retry,
+    goes to the least busy healthy node. Nodes which keep failing are
+    ejected and probed in the background until they answer again. For
+    latency aware routing or other settings pass a
+    :class:`kazoo.endpoints.EndpointPool` as ``endpoint_pool`` instead. ::
+
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      base_urls=["http://node1:8000/v1",
+        ...                                 "http://node2:8000/v1"])
+        >>>from kazoo.endpoints import EndpointPool
+        >>>pool = EndpointPool(base_urls, strategy="ewma", probe_interval=5)
+        >>>client = kazoo.Client(api_key="sdfasdfas", endpoint_pool=pool)
+
+    With ``coalesce_requests=True``, concurrent identical GET requests, with
+    the same url, are sent once and every caller is given that request's
+    response, or has its exception raised. This stops a burst of threads
+    which all miss the cache at once from each fetching the same document.
+    As with cached responses, callers share the returned objects and should
+    not modify them. Streamed and raw requests are never coalesced. ::
+
+        >>>client = kazoo.Client(api_key="sdfasdfas", coalesce_requests=True)
+
+    All requests made by a client, including :meth:`authenticate()`, share a
+    single pool of keep-alive HTTP connections. The pool can be tuned with the
+    ``pool_connections`` (number of hosts to keep pools for),
+    ``pool_maxsize`` (connections kept open per host) and ``keep_alive``
+    constructor arguments. Call :meth:`close()` to release the connections,
+    or use the client as a context manager: ::
+
+        >>>with kazoo.Client(api_key="sdfasdfas", pool_maxsize=50) as client:
+        ...    client.authenticate()
+        ...    client.get_callflows(acct_id)
+
+    A client is safe to share between any number of threads, and should be,
+    so that they share its auth token and connections. Set ``pool_maxsize``
+    to the number of threads so none of them waits for a connection. While
+    it is shared:
+
+    * :meth:`authenticate()` may be called from every thread, only the first
+      call makes an auth request, the others wait for it and return its
+      token, and later calls return immediately.
+    * When the token expires only one thread authenticates again, the others
+      which had the same token refused wait for and retry with the new one.
+      ``auth_token`` and ``auth_data`` always hold a token from a completed
+      authentication.
+    * Token stores, retry policies, circuit breakers, rate limiters,
+      endpoint pools and metrics may also be shared between clients, a
+      response cache may not, as it is keyed by url alone.
+    * Configuration, such as ``request_hooks`` or ``BASE_URL``, should be
+      set before the client is shared, and :meth:`close()` called once
+      every thread has finished with it.
+    * Cookies sent by the server are ignored, so the shared session is not
+      modified by responses. The API authenticates with the auth token, not
+      cookies, so nothing is lost.
+
     """
     __metaclass__ = RestClientMetaClass
     BASE_URL = "http://api.2600hz.com:8000/v1"
+    # Requests with these options set are never shared between callers
+    uncoalesced_options = ["data", "files", "body", "stream", "raw",
+                           "output", "if_none_match"]
 
     _accounts_resource = RestResource("account",
                                       "/accounts/{account_id}",
@@ -257,7 +537,10 @@ class Client(object):
                                    "/accounts/{account_id}/media/{media_id}",
                                    plural_name="media",
                                    method_names={
-                                       "list": "get_all_media"
+                                       "list": "get_all_media",
+                                       "bulk_create": "create_media_items",
+                                       "bulk_update": "update_media_items",
+                                       "bulk_delete": "delete_media_items",
                                    })
     _menus_resource = RestResource("menu",
                                    "/accounts/{account_id}/menus/{menu_id}")
@@ -312,7 +595,12 @@ class Client(object):
     )
 
     def __init__(self, api_key=None, password=None, account_name=None,
-                 username=None):
+                 username=None, pool_connections=10, pool_maxsize=10,
+                 keep_alive=True, cache=None, token_store=None,
+                 retry_policy=None, circuit_breaker=None, rate_limiter=None,
+                 request_hooks=None, metrics=None, accept_encoding=None,
+                 request_compression_threshold=None, json_codec=None,
+                 base_urls=None, endpoint_pool=None, coalesce_requests=False):
         if not api_key and not password:
             raise RuntimeError("You must pass either an api_key or an "
                                "account name/password pair")
@@ -332,37 +620,605 @@ class Client(object):
         self.api_key = api_key
         self._authenticated = False
         self.auth_token = None
+        self.auth_data = None
+        self._session = None
+        self._session_config = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "keep_alive": keep_alive,
+            # Cookies set by responses, such as a load balancer's sticky
+            # session cookie, would otherwise be copied into the session's
+            # cookie jar, which every thread reads, by each request
+            "store_cookies": False,
+        }
+        self._session_headers = None
+        if accept_encoding is not None:
+            self._session_headers = {"Accept-Encoding": accept_encoding}
+        self._session_lock = threading.Lock()
+        self.request_compression_threshold = request_compression_threshold
+        self.json_codec = json_codec
+        self.cache = cache
+        self.token_store = token_store
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        # Only a pool built here belongs to the client, one passed in may be
+        # shared with other clients and is left for its owner to close
+        self._owns_endpoint_pool = False
+        if endpoint_pool is None and base_urls is not None:
+            endpoint_pool = EndpointPool(base_urls)
+            self._owns_endpoint_pool = True
+        self.endpoint_pool = endpoint_pool
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = SingleFlight()
+        self.request_hooks = list(request_hooks or [])
+        self.metrics = metrics
+        if metrics is not None:
+            self.request_hooks.append(metrics)
+        self._auth_lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def session(self):
+        """The requests session holding the client's connection pool, created
+        on first use so that constructing a client stays cheap
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session_kwargs = {"config": self._session_config}
+                    if self._session_headers is not None:
+                        session_kwargs["headers"] = self._session_headers
+                    self._session = requests.session(**session_kwargs)
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def close(self):
+        """Close all pooled connections held by this client"""
+        if self._owns_endpoint_pool:
+            self.endpoint_pool.close()
+        if self._session is not None:
+            self._session.close()
 
     def authenticate(self):
         """Call this before making other api calls to fetch an auth token
         which will be automatically used for all further requests
         """
-        if not self._authenticated:
-            self.auth_data = self.auth_request.execute(self.BASE_URL)
-            self.auth_token = self.auth_data["auth_token"]
-            self._authenticated = True
-        return self.auth_token
+        if self._authenticated:
+            return self.auth_token
+        with self._auth_lock:
+            if not self._authenticated:
+                self._set_auth_data(self._get_auth_data())
+                self._authenticated = True
+            return self.auth_token
 
-    def _execute_request(self, request, **kwargs):
-        if request.auth_required:
-            kwargs["token"] = self.auth_token
-        return request.execute(self.BASE_URL, **kwargs)
+    def _set_auth_data(self, auth_data):
+        # The token is published last, threads which see it may rely on
+        # auth_data being the response it came from
+        self.auth_data = auth_data
+        self.auth_token = auth_data["auth_token"]
+
+    def _get_auth_data(self):
+        if self.token_store is None:
+            return self._send_to_endpoint(self._request_auth_data)
+        key = self._get_token_store_key()
+        auth_data = self.token_store.get(key)
+        if auth_data is None:
+            auth_data = self._send_to_endpoint(self._request_auth_data)
+            self.token_store.set(key, auth_data)
+        return auth_data
+
+    def _request_auth_data(self, base_url):
+        return self.auth_request.execute(base_url, session=self.session)
+
+    def _get_token_store_key(self):
+        if self.endpoint_pool is None:
+            base_url = self.BASE_URL
+        else:
+            # Tokens are valid on every node of a cluster, so it is
+            # identified by its first node
+            base_url = self.endpoint_pool.base_urls[0]
+        return "{0} {1}".format(base_url,
+                                self.auth_request.get_credentials_key())
+
+    def _refresh_auth_token(self, rejected_token):
+        """Authenticate again after rejected_token was refused. Only the first
+        of several threads which had the same token refused authenticates,
+        the others wait for and use its new token.
+        """
+        with self._auth_lock:
+            if self.auth_token == rejected_token:
+                if self.token_store is not None:
+                    self._discard_stored_token(rejected_token)
+                self._set_auth_data(self._get_auth_data())
+            return self.auth_token
+
+    def _discard_stored_token(self, rejected_token):
+        # Another process sharing the store may already have replaced the
+        # rejected token, in which case its token is used instead
+        key = self._get_token_store_key()
+        auth_data = self.token_store.get(key)
+        if auth_data is not None and \
+                auth_data.get("auth_token") == rejected_token:
+            self.token_store.delete(key)
+
+    def _execute_request(self, request, method_name=None, **kwargs):
+        kwargs["session"] = self.session
+        if self.request_compression_threshold is not None:
+            kwargs.setdefault("compress_threshold",
+                              self.request_compression_threshold)
+        if self.json_codec is not None:
+            kwargs.setdefault("codec", self.json_codec)
+        if not self.request_hooks:
+            return self._dispatch_request(request, kwargs)
+        trace = RequestTrace(request, method_name)
+        kwargs["trace"] = trace
+        for hook in self.request_hooks:
+            hook.before_request(trace)
+        try:
+            response = self._dispatch_request(request, kwargs)
+        except Exception as error:
+            trace.finish(error)
+            self._run_after_request_hooks(trace)
+            raise
+        trace.finish()
+        self._run_after_request_hooks(trace)
+        return response
+
+    def _run_after_request_hooks(self, trace):
+        for hook in self.request_hooks:
+            hook.after_request(trace)
+
+    def _dispatch_request(self, request, kwargs):
+        key = None
+        if self.coalesce_requests:
+            key = self._get_coalescing_key(request, kwargs)
+        if key is None:
+            return self._dispatch_uncoalesced(request, kwargs)
+        response, shared = self._in_flight.call(
+            key, lambda: self._dispatch_uncoalesced(request, kwargs))
+        if shared and kwargs.get("trace") is not None:
+            kwargs["trace"].coalesced = True
+        return response
+
+    def _get_coalescing_key(self, request, kwargs):
+        method = kwargs.get("method") or request.method
+        if method.lower() != "get" or any(
+                kwargs.get(name) for name in self.uncoalesced_options):
+            return None
+        try:
+            return method.lower(), request.get_relative_url(kwargs)
+        except KeyError:
+            # A missing url parameter, left for execute to report
+            return None
+
+    def _dispatch_uncoalesced(self, request, kwargs):
+        if (self.cache is not None and request.resource_name is not None and
+                not kwargs.get("raw")):
+            return self._execute_cached_request(request, kwargs)
+        return self._send(request, kwargs)
+
+    def _send(self, request, kwargs):
+        method = kwargs.get("method") or request.method
+        retries = 0
+        while True:
+            try:
+                return self._send_once(request, method, kwargs)
+            except Exception as error:
+                policy = self.retry_policy
+                if (policy is None or not is_retryable(error) or
+                        not policy.should_retry(method, retries, error)):
+                    raise
+                policy.sleep(policy.get_backoff(retries, error))
+                retries += 1
+                if kwargs.get("trace") is not None:
+                    kwargs["trace"].retries += 1
+
+    def _send_once(self, request, method, kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method, request.resource_name)
+        return self._send_to_endpoint(
+            lambda base_url: self._send_to_host(base_url, request, kwargs))
+
+    def _send_to_endpoint(self, send):
+        """Call send with the base url of the node to send a request to,
+        recording its outcome with the endpoint pool if there is one
+        """
+        pool = self.endpoint_pool
+        if pool is None:
+            return send(self.BASE_URL)
+        endpoint = pool.acquire()
+        start = time.time()
+        try:
+            response = send(endpoint.base_url)
+        except Exception as error:
+            pool.release(endpoint, time.time() - start,
+                         failed=is_retryable(error) and not isinstance(
+                             error, exceptions.CircuitOpenError))
+            raise
+        pool.release(endpoint, time.time() - start)
+        return response
+
+    def _send_to_host(self, base_url, request, kwargs):
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send_authenticated(base_url, request, kwargs)
+        breaker.before_request(base_url)
+        try:
+            response = self._send_authenticated(base_url, request, kwargs)
+        except Exception as error:
+            if is_retryable(error):
+                breaker.record_failure(base_url)
+            else:
+                breaker.record_success(base_url)
+            raise
+        breaker.record_success(base_url)
+        return response
+
+    def _send_authenticated(self, base_url, request, kwargs):
+        if not request.auth_required:
+            return request.execute(base_url, **kwargs)
+        token = self.auth_token
+        kwargs["token"] = token
+        try:
+            return request.execute(base_url, **kwargs)
+        except exceptions.KazooApiAuthenticationError:
+            if not self._authenticated:
+                raise
+            kwargs["token"] = self._refresh_auth_token(token)
+            return request.execute(base_url, **kwargs)
+
+    def _execute_cached_request(self, request, kwargs):
+        key = request.get_relative_url(kwargs)
+        if request.method != "get":
+            try:
+                return self._send(request, kwargs)
+            finally:
+                self.cache.invalidate(key, request.collection_path)
+        if kwargs.get("stream"):
+            return self._send(request, kwargs)
+        response = self.cache.get(key)
+        if response is None:
+            response = self._fetch_into_cache(request, key,
+                                              request.resource_name, kwargs)
+        return response
+
+    def _fetch_into_cache(self, request, key, resource_name, kwargs):
+        stale_response = self.cache.get_stale(key)
+        revision = get_revision(stale_response)
+        if revision is not None:
+            kwargs["if_none_match"] = '"{0}"'.format(revision)
+        else:
+            # A 304 to the caller's own If-None-Match could not be answered
+            # from the cache, so fetch the whole document
+            kwargs.pop("if_none_match", None)
+        response = self._send(request, kwargs)
+        if response is None:
+            response = stale_response
+        self.cache.set(key, response, resource_name)
+        return response
+
+    def revalidate_cache(self, keys=None, max_workers=10, errors=None):
+        """Check cached responses against the server in one concurrent pass,
+        refreshing those which have changed and removing those which the
+        server reports are not found or invalid. Responses with a revision
+        are revalidated with a conditional request so unchanged documents are
+        not downloaded again.
+
+        keys defaults to every key in the cache. Returns the keys whose
+        responses were replaced or removed. Responses which could not be
+        checked for any other reason, such as the API being unavailable, are
+        kept. If errors is a dictionary the exception raised for each of
+        their keys is added to it, otherwise the first is raised once every
+        key has been checked.
+        """
+        if keys is None:
+            keys = self.cache.keys()
+        results = Client.map(self, self._revalidate_cache_key,
+                             [(key,) for key in keys], max_workers)
+        changed_keys = []
+        failures = []
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                failures.append((key, result))
+            elif result is True:
+                changed_keys.append(key)
+        if errors is not None:
+            errors.update(failures)
+        elif failures:
+            raise failures[0][1]
+        return changed_keys
+
+    def _revalidate_cache_key(self, key):
+        stale_response = self.cache.get_stale(key)
+        request = KazooRequest(key)
+        try:
+            response = self._fetch_into_cache(
+                request, key, self.cache.get_resource_name(key),
+                {"session": self.session})
+        except (exceptions.KazooApiNotFoundError,
+                exceptions.KazooApiBadDataError):
+            self.cache.delete(key)
+            return True
+        return response is not stale_response
+
+    def map(self, method, arg_tuples, max_workers=10):
+        """Call one of the client's API methods once for each tuple of
+        positional arguments in arg_tuples, running up to max_workers calls
+        at a time over the client's connection pool. ::
+
+            >>>client.map("get_device", [(acct_id, dev_id) for dev_id in ids])
+
+        method may be a method name or a bound method of this client. Results
+        are returned in the same order as arg_tuples, if a call raised then
+        the exception is returned in its place rather than being raised.
+        ``pool_maxsize`` should be at least max_workers so that connections
+        are reused rather than discarded.
+        """
+        pool = WorkerPool(max_workers)
+        try:
+            method = self._get_map_method(method)
+            futures = [pool.submit(method, *args) for args in arg_tuples]
+            return self._collect_results(futures)
+        finally:
+            pool.shutdown(wait=False)
+
+    def _execute_bulk(self, method_name, keyed_args, max_workers, stream):
+        pool = WorkerPool(max_workers)
+        method = getattr(self, method_name)
+        submit = lambda args: pool.submit(method, *args)
+        results = self._iter_bulk_results(submit, keyed_args, pool)
+        if stream:
+            return results
+        return BulkReport(results)
+
+    def _iter_bulk_results(self, submit, keyed_args, pool):
+        try:
+            for result in iter_bulk_results(submit, keyed_args):
+                yield result
+        finally:
+            pool.shutdown(wait=False)
+
+    def _get_bulk_pairs(self, updates):
+        if hasattr(updates, "items"):
+            return updates.items()
+        return updates
+
+    def _get_map_method(self, method):
+        if isinstance(method, basestring):
+            return getattr(self, method)
+        return method
+
+    def _collect_results(self, futures):
+        results = []
+        for future in futures:
+            exception = future.exception()
+            if exception is not None:
+                results.append(exception)
+            else:
+                results.append(future.result())
+        return results
+
+    def _iter_list_request(self, rest_resource, page_size, method_name=None,
+                           **kwargs):
+        def get_page_request(start_key):
+            get_params = {"page_size": page_size}
+            if start_key is not None:
+                get_params["start_key"] = start_key
+            return rest_resource.get_list_request(get_params=get_params,
+                                                  **kwargs)
+        return self._iter_pages(get_page_request, method_name)
+
+    def _iter_pages(self, get_page_request, method_name=None):
+        pool = WorkerPool(1)
+        submit = lambda request: pool.submit(self._execute_request, request,
+                                             method_name=method_name)
+        try:
+            for record in iter_pages(get_page_request, submit):
+                yield record
+        finally:
+            pool.shutdown(wait=False)
+
+    def crawl_accounts(self, account_id, max_workers=10, checkpoint_path=None,
+                       checkpoint_interval=100, page_size=None):
+        """Yield every account below account_id, walking the account tree
+        breadth first with :meth:`get_account_children`, max_workers
+        requests at a time. Unlike :meth:`get_account_descendants` the whole
+        tree is never held in one response. ::
+
+            >>>for account in client.crawl_accounts(reseller_id,
+            ...                                     checkpoint_path="crawl.json"):
+            ...    print account["id"]
+
+        Every page of each account's children is followed, page_size sets
+        how many children are requested per page instead of the server's
+        default. With a checkpoint_path an interrupted crawl resumes where it
+        stopped when called again, see :class:`kazoo.crawler.AccountCrawler`.
+        """
+        def get_children_request(child_id, start_key):
+            get_params = {}
+            if page_size is not None:
+                get_params["page_size"] = page_size
+            if start_key is not None:
+                get_params["start_key"] = start_key
+            return self._accounts_resource.get_extra_view_request(
+                "children", get_params=get_params or None,
+                account_id=child_id)
+        crawler = AccountCrawler(account_id, get_children_request,
+                                 max_workers, checkpoint_path,
+                                 checkpoint_interval)
+        return self._run_crawler(crawler, max_workers)
+
+    def _run_crawler(self, crawler, max_workers):
+        pool = WorkerPool(max_workers)
+        submit = lambda request: pool.submit(self._execute_request, request,
+                                             method_name="crawl_accounts")
+        try:
+            for account in crawler.crawl(submit):
+                yield account
+        finally:
+            pool.shutdown(wait=False)
 
     def search_phone_numbers(self, prefix, quantity=10):
         request = KazooRequest("/phone_numbers", get_params={
             "prefix": prefix,
             "quantity": quantity
         })
-        return self._execute_request(request)
+        return self._execute_request(request,
+                                     method_name="search_phone_numbers")
 
     def create_phone_number(self, acct_id, phone_number):
         request = KazooRequest("/accounts/{account_id}/phone_numbers/{phone_number}",
                                method="put")
         return self._execute_request(request,
+                                     method_name="create_phone_number",
                                      account_id=acct_id, phone_number=phone_number)
 
     def upload_phone_number_file(self, acct_id, phone_number, filename, file_obj):
         """Uploads a file like object as part of a phone numbers documents"""
         request = KazooRequest("/accounts/{account_id}/phone_numbers/{phone_number}",
                                method="post")
-        return self._execute_request(request, files={filename: file_obj})
+        return self._execute_request(request,
+                                     method_name="upload_phone_number_file",
+                                     account_id=acct_id,
+                                     phone_number=phone_number,
+                                     files={filename: file_obj})
+
+    def upload_phone_number_doc(self, acct_id, phone_number, filename,
+                                file_obj, content_type="application/pdf"):
+        """Uploads a file like object, such as a port request form, as one
+        of a phone number's documents. The file is sent in blocks rather
+        than read into memory.
+        """
+        request = KazooRequest("/accounts/{account_id}/phone_numbers/{phone_number}/docs/{filename}",
+                               method="put")
+        return self._execute_request(request,
+                                     method_name="upload_phone_number_doc",
+                                     account_id=acct_id,
+                                     phone_number=phone_number,
+                                     filename=filename, body=file_obj,
+                                     content_type=content_type)
+
+    def download_phone_number_doc(self, acct_id, phone_number, filename,
+                                  file_obj):
+        """Writes one of a phone number's documents to a file like object as
+        it is downloaded
+        """
+        request = KazooRequest("/accounts/{account_id}/phone_numbers/{phone_number}/docs/{filename}")
+        return self._execute_request(request,
+                                     method_name="download_phone_number_doc",
+                                     account_id=acct_id,
+                                     phone_number=phone_number,
+                                     filename=filename, output=file_obj)
+
+    def upload_media(self, acct_id, media_id, file_obj,
+                     content_type="audio/mpeg"):
+        """Uploads the audio of a media document from a file like object,
+        which is sent in blocks rather than read into memory
+        """
+        request = KazooRequest("/accounts/{account_id}/media/{media_id}/raw",
+                               method="post")
+        return self._execute_request(request, method_name="upload_media",
+                                     account_id=acct_id, media_id=media_id,
+                                     body=file_obj, content_type=content_type)
+
+    def download_media(self, acct_id, media_id, file_obj):
+        """Writes the audio of a media document to a file like object as it
+        is downloaded
+        """
+        request = KazooRequest("/accounts/{account_id}/media/{media_id}/raw")
+        return self._execute_request(request, method_name="download_media",
+                                     account_id=acct_id, media_id=media_id,
+                                     output=file_obj)
+
+    def download_voicemail_message(self, acct_id, vmbox_id, media_id,
+                                   file_obj):
+        """Writes the audio of a voicemail message to a file like object as
+        it is downloaded
+        """
+        request = KazooRequest("/accounts/{account_id}/vmboxes/{vmbox_id}/messages/{media_id}/raw")
+        return self._execute_request(request,
+                                     method_name="download_voicemail_message",
+                                     account_id=acct_id, vmbox_id=vmbox_id,
+                                     media_id=media_id, output=file_obj)
+
+
+class AsyncClient(Client):
+    """A client whose API methods return immediately with a
+    :class:`kazoo.executor.Future` instead of blocking on the HTTP request.
+
+    Every method generated for :class:`Client` is available, the request is
+    run on a bounded pool of ``max_workers`` threads which share the client's
+    connection pool. ::
+
+        >>>client = kazoo.AsyncClient(api_key="sdfasdfas", max_workers=50)
+        >>>client.authenticate()
+        >>>futures = [client.get_device(acct_id, device_id)
+        ...           for device_id in device_ids]
+        >>>devices = [future.result() for future in futures]
+
+    :meth:`authenticate()` still blocks, as nothing can be sent until it has
+    completed. Bulk methods run at most their ``max_workers`` items at once,
+    and never more than the client's pool has threads. The remaining
+    arguments are the same as for :class:`Client`, ``pool_maxsize`` defaults
+    to ``max_workers``.
+    """
+
+    def __init__(self, api_key=None, password=None, account_name=None,
+                 username=None, max_workers=10, **kwargs):
+        kwargs.setdefault("pool_maxsize", max_workers)
+        super(AsyncClient, self).__init__(api_key=api_key,
+                                          password=password,
+                                          account_name=account_name,
+                                          username=username,
+                                          **kwargs)
+        self.worker_pool = WorkerPool(max_workers)
+
+    def close(self):
+        """Wait for outstanding requests, then close all pooled connections"""
+        self.worker_pool.shutdown()
+        super(AsyncClient, self).close()
+
+    def map(self, method, arg_tuples):
+        """As :meth:`Client.map`, using this client's worker pool"""
+        method = self._get_map_method(method)
+        return self._collect_results([method(*args) for args in arg_tuples])
+
+    def _execute_bulk(self, method_name, keyed_args, max_workers, stream):
+        # The worker pool is shared with the client's other calls, so a
+        # semaphore bounds how many of this bulk call's items it runs at once
+        method = getattr(self, method_name)
+        semaphore = threading.Semaphore(max_workers)
+
+        def submit(args):
+            semaphore.acquire()
+            future = method(*args)
+            future.add_done_callback(lambda future: semaphore.release())
+            return future
+        results = iter_bulk_results(submit, keyed_args)
+        if stream:
+            return results
+        return BulkReport(results)
+
+    def _run_crawler(self, crawler, max_workers):
+        submit = lambda request: self._execute_request(
+            request, method_name="crawl_accounts")
+        return crawler.crawl(submit)
+
+    def _iter_pages(self, get_page_request, method_name=None):
+        submit = lambda request: self._execute_request(
+            request, method_name=method_name)
+        return iter_pages(get_page_request, submit)
+
+    def _execute_request(self, request, **kwargs):
+        execute = super(AsyncClient, self)._execute_request
+        return self.worker_pool.submit(execute, request, **kwargs)
@@ -0,0 +1,113 @@
+import collections
+import functools
+import json
+import os
+import Queue
+import tempfile
+from kazoo.paging import iter_pages
+
+
+class AccountCrawler(object):
+    """Walks the tree of accounts below root_account_id breadth first, one
+    children request per account with up to max_in_flight requests at once.
+
+    get_children_request is called with an account id and the start key of
+    a page of its children (None for the first page) and returns the request
+    for that page. The first page of each account's children is fetched
+    concurrently with the others, later pages are fetched while the
+    account's children are yielded, see :func:`kazoo.paging.iter_pages`.
+
+    If checkpoint_path is given the accounts still to be visited are saved
+    there every checkpoint_interval accounts, and when the crawl stops
+    early, so a later crawl with the same checkpoint_path carries on from
+    where it stopped. The checkpoint is removed once the whole tree has been
+    crawled.
+
+    Resuming may yield again the children of accounts whose requests were in
+    flight when the crawl stopped, so consumers should expect to see an
+    account more than once.
+    """
+
+    def __init__(self, root_account_id, get_children_request,
+                 max_in_flight=10, checkpoint_path=None,
+                 checkpoint_interval=100):
+        self.root_account_id = root_account_id
+        self.get_children_request = get_children_request
+        self.max_in_flight = max_in_flight
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+
+    def crawl(self, submit):
+        """Yield each account below the root as its parent's children are
+        fetched. submit takes a request and returns a
+        :class:`kazoo.executor.Future` for its response.
+        """
+        frontier = collections.deque(self._load_frontier())
+        in_flight = set()
+        completed = Queue.Queue()
+        visited = 0
+        finished = False
+        try:
+            self._dispatch(frontier, in_flight, completed, submit)
+            while in_flight:
+                account_id, future = completed.get()
+                get_page_request = functools.partial(
+                    self.get_children_request, account_id)
+                child_ids = []
+                for child in iter_pages(get_page_request, submit, future):
+                    yield child
+                    child_ids.append(child["id"])
+                in_flight.remove(account_id)
+                frontier.extend(child_ids)
+                visited += 1
+                if visited % self.checkpoint_interval == 0:
+                    self._save_frontier(in_flight, frontier)
+                self._dispatch(frontier, in_flight, completed, submit)
+            finished = True
+        finally:
+            if finished:
+                self._remove_checkpoint()
+            else:
+                self._save_frontier(in_flight, frontier)
+
+    def _dispatch(self, frontier, in_flight, completed, submit):
+        while frontier and len(in_flight) < self.max_in_flight:
+            account_id = frontier.popleft()
+            future = submit(self.get_children_request(account_id, None))
+            in_flight.add(account_id)
+            future.add_done_callback(
+                lambda future, account_id=account_id:
+                completed.put((account_id, future)))
+
+    def _load_frontier(self):
+        if self.checkpoint_path is None:
+            return [self.root_account_id]
+        try:
+            with open(self.checkpoint_path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except IOError:
+            return [self.root_account_id]
+        if checkpoint["root_account_id"] != self.root_account_id:
+            raise ValueError("The checkpoint at {0} is for a crawl of account "
+                             "{1}".format(self.checkpoint_path,
+                                          checkpoint["root_account_id"]))
+        return checkpoint["frontier"]
+
+    def _save_frontier(self, in_flight, frontier):
+        if self.checkpoint_path is None:
+            return
+        checkpoint = {"root_account_id": self.root_account_id,
+                      "frontier": sorted(in_flight) + list(frontier)}
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w") as temp_file:
+            json.dump(checkpoint, temp_file)
+        os.rename(temp_path, self.checkpoint_path)
+
+    def _remove_checkpoint(self):
+        if self.checkpoint_path is None:
+            return
+        try:
+            os.remove(self.checkpoint_path)
+        except OSError:
+            pass
@@ -0,0 +1,172 @@
+import itertools
+import threading
+import time
+
+
+def probe_base_url(base_url, timeout=5):
+    """Whether the API node at base_url answers HTTP requests, any response
+    short of a server error counts, as the probe is not authenticated
+    """
+    import requests
+    try:
+        response = requests.get(base_url, timeout=timeout,
+                                config={"keep_alive": False})
+    except (requests.exceptions.RequestException, IOError):
+        return False
+    return response.status_code < 500
+
+
+class Endpoint(object):
+    """The routing state of one API node"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.in_flight = 0
+        self.latency = None
+        self.consecutive_failures = 0
+        self.ejected_at = None
+
+    @property
+    def healthy(self):
+        return self.ejected_at is None
+
+    def __repr__(self):
+        return "Endpoint({0!r})".format(self.base_url)
+
+
+class EndpointPool(object):
+    """Routes requests between several API nodes.
+
+    With the ``"least_in_flight"`` strategy each request goes to the node
+    with the fewest requests in progress, taking turns between equally busy
+    nodes. With ``"ewma"`` the node's exponentially weighted moving average
+    latency, with smoothing factor decay, is multiplied by its requests in
+    progress plus one and the lowest score wins, so slow nodes are given
+    less work.
+
+    A node which fails failure_threshold requests in a row with a retryable
+    error (see :func:`kazoo.retry.is_retryable`) is ejected and no longer
+    chosen while any node is healthy. Ejected nodes are probed from a
+    background thread every probe_interval seconds by calling
+    ``probe(base_url)``, and are let back in once a probe succeeds.
+
+    Safe to share between threads and clients. A client only closes a pool
+    it created from its ``base_urls``, so call :meth:`close()` on a shared
+    pool once no client uses it.
+    """
+
+    strategies = ["least_in_flight", "ewma"]
+
+    def __init__(self, base_urls, strategy="least_in_flight",
+                 failure_threshold=3, probe_interval=10, decay=0.3,
+                 failure_penalty=1.0, probe=probe_base_url, clock=time.time):
+        if not base_urls:
+            raise ValueError("at least one base url is required")
+        if strategy not in self.strategies:
+            raise ValueError("strategy must be one of {0}".format(
+                ", ".join(self.strategies)))
+        self.endpoints = [Endpoint(base_url) for base_url in base_urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.decay = decay
+        self.failure_penalty = failure_penalty
+        self.probe = probe
+        self._clock = clock
+        self._turns = itertools.count()
+        self._lock = threading.Lock()
+        self._prober = None
+        self._closed = threading.Event()
+
+    @property
+    def base_urls(self):
+        return [endpoint.base_url for endpoint in self.endpoints]
+
+    def acquire(self):
+        """Choose the endpoint for a request and count it as in progress
+        until :meth:`release()` is called
+        """
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint.healthy]
+            if not candidates:
+                # Better to try nodes which may have recovered than to fail
+                # every request until a probe succeeds
+                candidates = self.endpoints
+            turn = next(self._turns)
+            count = len(candidates)
+            candidates = [candidates[(turn + index) % count]
+                          for index in range(count)]
+            endpoint = min(candidates, key=self._get_score)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def _get_score(self, endpoint):
+        if self.strategy == "ewma":
+            return (endpoint.latency or 0) * (endpoint.in_flight + 1)
+        return endpoint.in_flight
+
+    def release(self, endpoint, latency, failed=False):
+        """Record the outcome of a request sent to endpoint, which took
+        latency seconds and failed if the node could not handle it
+        """
+        with self._lock:
+            endpoint.in_flight -= 1
+            if failed:
+                latency = max(latency, self.failure_penalty)
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.decay * (latency - endpoint.latency)
+            if not failed:
+                endpoint.consecutive_failures = 0
+                return
+            endpoint.consecutive_failures += 1
+            if (endpoint.healthy and
+                    endpoint.consecutive_failures >= self.failure_threshold):
+                endpoint.ejected_at = self._clock()
+                self._start_prober()
+
+    def _start_prober(self):
+        if self._closed.is_set() or (self._prober is not None and
+                                     self._prober.is_alive()):
+            return
+        self._prober = threading.Thread(target=self._run_prober,
+                                        name="kazoo-endpoint-prober")
+        self._prober.daemon = True
+        self._prober.start()
+
+    def _run_prober(self):
+        while not self._closed.wait(self.probe_interval):
+            if not self.probe_ejected():
+                with self._lock:
+                    if not any(not endpoint.healthy
+                               for endpoint in self.endpoints):
+                        self._prober = None
+                        return
+
+    def probe_ejected(self):
+        """Probe each ejected endpoint once, letting back in those which
+        answer. Returns the number still ejected.
+        """
+        with self._lock:
+            ejected = [endpoint for endpoint in self.endpoints
+                       if not endpoint.healthy]
+        still_ejected = 0
+        for endpoint in ejected:
+            if self.probe(endpoint.base_url):
+                with self._lock:
+                    endpoint.ejected_at = None
+                    endpoint.consecutive_failures = 0
+                    endpoint.latency = None
+            else:
+                still_ejected += 1
+        return still_ejected
+
+    def close(self):
+        """Stop probing ejected endpoints"""
+        self._closed.set()
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
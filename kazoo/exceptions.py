@@ -15,6 +15,29 @@ class KazooApiError(RuntimeError):
     pass
 
 
+class KazooApiAuthenticationError(KazooApiError):
+    pass
+
+
+class KazooApiNotFoundError(KazooApiError):
+    pass
+
+
+class KazooApiUnavailableError(KazooApiError):
+    """The API could not handle the request right now, it may succeed if
+    retried, after retry_after seconds if the server specified a delay
+    """
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super(KazooApiUnavailableError, self).__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(KazooApiUnavailableError):
+    pass
+
+
 class KazooApiBadDataError(RuntimeError):
 
     def __init__(self, field_errors):
@@ -0,0 +1,202 @@
+import logging
+import Queue
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Future(object):
+    """The pending result of a call submitted to a :class:`WorkerPool`"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._done = False
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def done(self):
+        return self._done
+
+    def result(self, timeout=None):
+        """Block until the call completes and return its result, re-raising
+        any exception the call raised
+        """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """Block until the call completes and return the exception it raised,
+        or None if it succeeded
+        """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            return self._exc_info[1]
+        return None
+
+    def add_done_callback(self, func):
+        """Call func with this future once it completes, immediately if it
+        already has
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(func)
+                return
+        func(self)
+
+    def set_result(self, result):
+        self._complete(result, None)
+
+    def set_exception_info(self, exc_info):
+        self._complete(None, exc_info)
+
+    def _wait(self, timeout):
+        with self._condition:
+            if not self._done:
+                self._condition.wait(timeout)
+            if not self._done:
+                raise RuntimeError("Timed out waiting for result")
+
+    def _complete(self, result, exc_info):
+        with self._condition:
+            self._result = result
+            self._exc_info = exc_info
+            self._done = True
+            self._condition.notify_all()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("Exception in future callback")
+
+
+class WorkerPool(object):
+    """A bounded pool of daemon threads which run submitted calls and hand
+    back a :class:`Future` for each one. Threads are only started as work
+    arrives, up to max_workers.
+    """
+
+    def __init__(self, max_workers=10):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._idle = 0
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to a pool after shutdown")
+            self._queue.put((future, func, args, kwargs))
+            if (self._queue.qsize() > self._idle and
+                    len(self._threads) < self.max_workers):
+                self._start_thread()
+        return future
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start_thread(self):
+        thread = threading.Thread(target=self._work)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+            if item is None:
+                return
+            future, func, args, kwargs = item
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception:
+                future.set_exception_info(sys.exc_info())
+            except:
+                # Such as SystemExit, which ends this thread once the future
+                # is resolved, a replacement is started for later work
+                future.set_exception_info(sys.exc_info())
+                with self._lock:
+                    self._threads.remove(threading.current_thread())
+                raise
+
+
+class SingleFlight(object):
+    """Lets concurrent calls with the same key share one execution. The
+    first caller for a key runs the call, callers arriving while it is in
+    progress wait for and are handed its result, or have its exception
+    raised. Once the call completes the next caller for the key runs it
+    again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def call(self, key, func):
+        """Return the result of func(), shared with concurrent calls for key.
+        Returns a ``(result, shared)`` pair, where shared is true if the
+        result came from another caller's execution.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                leader = True
+            else:
+                leader = False
+                self._waiting += 1
+        if not leader:
+            try:
+                return future.result(), True
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        try:
+            result = func()
+        except:
+            # Also for exceptions such as KeyboardInterrupt, which would
+            # otherwise leave the key's waiters blocked forever
+            exc_info = sys.exc_info()
+            self._finish(key)
+            future.set_exception_info(exc_info)
+            raise exc_info[0], exc_info[1], exc_info[2]
+        self._finish(key)
+        future.set_result(result)
+        return result, False
+
+    def _finish(self, key):
+        with self._lock:
+            del self._calls[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    @property
+    def waiting(self):
+        """The number of callers waiting for another's call to complete"""
+        with self._lock:
+            return self._waiting
@@ -0,0 +1,48 @@
+import json
+
+PREFERRED_MODULES = ["ujson", "simplejson", "json"]
+
+
+class JsonCodec(object):
+    """Encodes request data and decodes response bodies with a module
+    providing the same dumps and loads functions as the standard library's
+    json module, such as ujson or simplejson.
+    """
+
+    def __init__(self, module=json):
+        self.module = module
+        self.name = module.__name__
+
+    def dumps(self, obj):
+        return self.module.dumps(obj)
+
+    def loads(self, content):
+        return self.module.loads(content)
+
+    def decode_response(self, raw_response):
+        """The decoded body of a response, or None if it is empty or not
+        JSON, like the json attribute of a requests response
+        """
+        content = raw_response.content
+        if not content:
+            return None
+        try:
+            return self.module.loads(content)
+        except ValueError:
+            return None
+
+    def __repr__(self):
+        return "JsonCodec({0})".format(self.name)
+
+
+def get_codec(module_names=PREFERRED_MODULES):
+    """A :class:`JsonCodec` for the first of module_names which can be
+    imported, falling back to the standard library's json module
+    """
+    for module_name in module_names:
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        return JsonCodec(module)
+    return JsonCodec(json)
@@ -0,0 +1,210 @@
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram(object):
+    """Counts observations into buckets with the given upper bounds, plus a
+    final unbounded bucket. Percentiles are estimated by interpolating
+    within the bucket they fall in, so they are only as precise as the
+    buckets are narrow.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index < len(self.buckets):
+                    upper = min(self.buckets[index], self.max)
+                else:
+                    upper = self.max
+                fraction = (rank - cumulative) / float(count)
+                return lower + (upper - lower) * max(fraction, 0.0)
+            cumulative += count
+        return self.max
+
+
+class EndpointMetrics(object):
+    """The metrics recorded for one client method"""
+
+    def __init__(self, buckets):
+        self.latency = Histogram(buckets)
+        self.errors = {}
+        self.retries = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """Clear the histogram and counters, requests in flight are still
+        counted until they finish
+        """
+        with self.lock:
+            self.latency = Histogram(self.latency.buckets)
+            self.errors = {}
+            self.retries = 0
+
+
+class MetricsRegistry(object):
+    """Aggregates the requests made by one or more clients: a latency
+    histogram, error counts by exception type, retry counts and the number
+    of requests in flight, per client method. Pass it to a client as
+    ``metrics`` and read it with :meth:`snapshot` or
+    :meth:`to_prometheus`. ::
+
+        >>>metrics = MetricsRegistry()
+        >>>client = kazoo.Client(api_key="sdfasdfas", metrics=metrics)
+        >>>metrics.percentile("get_callflow", 99)
+        0.042
+
+    Recording takes one short lock per method, so it can be left on under
+    load. Requests not made through a generated method are recorded by
+    their url template.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def before_request(self, trace):
+        endpoint = self._get_endpoint(trace)
+        with endpoint.lock:
+            endpoint.in_flight += 1
+
+    def after_request(self, trace):
+        endpoint = self._get_endpoint(trace)
+        with endpoint.lock:
+            endpoint.in_flight -= 1
+            endpoint.latency.observe(trace.duration)
+            endpoint.retries += trace.retries
+            if trace.error is not None:
+                error_name = type(trace.error).__name__
+                endpoint.errors[error_name] = \
+                    endpoint.errors.get(error_name, 0) + 1
+
+    def _get_endpoint(self, trace):
+        name = trace.method_name or trace.url_template
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            with self._lock:
+                endpoint = self._endpoints.setdefault(
+                    name, EndpointMetrics(self.buckets))
+        return endpoint
+
+    def percentile(self, method_name, percent):
+        """The estimated latency in seconds which percent of the calls of
+        method_name completed within, or None if it has not been called
+        """
+        endpoint = self._endpoints.get(method_name)
+        if endpoint is None:
+            return None
+        with endpoint.lock:
+            return endpoint.latency.percentile(percent)
+
+    def snapshot(self):
+        """A dictionary of the current metrics of each method"""
+        result = {}
+        for name, endpoint in self._items():
+            with endpoint.lock:
+                latency = endpoint.latency
+                result[name] = {
+                    "count": latency.count,
+                    "sum": latency.sum,
+                    "max": latency.max,
+                    "p50": latency.percentile(50),
+                    "p90": latency.percentile(90),
+                    "p99": latency.percentile(99),
+                    "errors": dict(endpoint.errors),
+                    "retries": endpoint.retries,
+                    "in_flight": endpoint.in_flight,
+                }
+        return result
+
+    def reset(self):
+        """Clear the recorded metrics, keeping the count of requests in
+        flight so that those which finish later are not counted below zero
+        """
+        for _, endpoint in self._items():
+            endpoint.reset()
+
+    def to_prometheus(self, prefix="kazoo"):
+        """The metrics in the Prometheus text exposition format"""
+        latency_lines = []
+        error_lines = []
+        retry_lines = []
+        in_flight_lines = []
+        for name, endpoint in self._items():
+            label = 'method="{0}"'.format(_escape_label(name))
+            with endpoint.lock:
+                latency = endpoint.latency
+                cumulative = 0
+                for bound, count in zip(latency.buckets + ("+Inf",),
+                                        latency.counts):
+                    cumulative += count
+                    latency_lines.append(
+                        '{0}_request_duration_seconds_bucket{{{1},le="{2}"}} '
+                        '{3}'.format(prefix, label, bound, cumulative))
+                latency_lines.append("{0}_request_duration_seconds_sum{{{1}}} "
+                                     "{2!r}".format(prefix, label,
+                                                    latency.sum))
+                latency_lines.append("{0}_request_duration_seconds_count{{{1}}}"
+                                     " {2}".format(prefix, label,
+                                                   latency.count))
+                for error_name, count in sorted(endpoint.errors.items()):
+                    error_lines.append(
+                        '{0}_request_errors_total{{{1},error="{2}"}} '
+                        '{3}'.format(prefix, label, error_name, count))
+                retry_lines.append("{0}_request_retries_total{{{1}}} "
+                                   "{2}".format(prefix, label,
+                                                endpoint.retries))
+                in_flight_lines.append("{0}_requests_in_flight{{{1}}} "
+                                       "{2}".format(prefix, label,
+                                                    endpoint.in_flight))
+        lines = []
+        for name, metric_type, description, metric_lines in [
+                ("request_duration_seconds", "histogram",
+                 "Time taken by client method calls.", latency_lines),
+                ("request_errors_total", "counter",
+                 "Client method calls which raised, by exception type.",
+                 error_lines),
+                ("request_retries_total", "counter",
+                 "Requests retried by the client's retry policy.",
+                 retry_lines),
+                ("requests_in_flight", "gauge",
+                 "Client method calls currently in progress.",
+                 in_flight_lines)]:
+            lines.append("# HELP {0}_{1} {2}".format(prefix, name,
+                                                     description))
+            lines.append("# TYPE {0}_{1} {2}".format(prefix, name,
+                                                     metric_type))
+            lines.extend(metric_lines)
+        return "\n".join(lines) + "\n"
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._endpoints.items())
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n",
+                                                                   "\\n")
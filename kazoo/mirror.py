@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import time
+from kazoo.bulk import iter_bulk_results
+from kazoo.cache import get_revision
+from kazoo.executor import Future, WorkerPool
+from kazoo.rest_resources import RestResource
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    account_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    revision TEXT,
+    data TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (account_id, resource, id)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    account_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (account_id, resource)
+);
+"""
+
+
+class AccountMirror(object):
+    """Keeps a copy of an account's documents in a local SQLite database so
+    that they can be read without going through the API. ::
+
+        >>>mirror = AccountMirror(client, "/var/lib/kazoo/mirror.db")
+        >>>mirror.sync(acct_id)
+        >>>for device in mirror.iter_documents(acct_id, "device"):
+        ...    print device["name"]
+
+    Every rest resource of the client which can be listed and fetched by id
+    for an account is mirrored, documents are stored by resource name
+    ("callflow", "device", "voicemail_box", ...). Each sync lists the
+    resource, fetches documents it has not seen, revalidates the others
+    with their stored revision so that unchanged documents are not
+    downloaded again, and removes documents which no longer exist.
+
+    client should be a :class:`kazoo.Client` or :class:`kazoo.AsyncClient`,
+    if it has a response cache then documents can be up to the cache's ttl
+    out of date. The mirror must only be used from the thread which created
+    it.
+    """
+
+    def __init__(self, client, path, max_workers=10, page_size=500):
+        self.client = client
+        self.path = path
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_resources(self):
+        """The client's rest resources which can be mirrored, by name"""
+        resources = {}
+        for cls in reversed(type(self.client).__mro__):
+            for value in vars(cls).values():
+                if (isinstance(value, RestResource) and
+                        value.required_args == ["account_id"] and
+                        "list" in value.methods and
+                        "detail" in value.methods):
+                    resources[value.name] = value
+        return resources
+
+    def sync(self, account_id, resource_names=None):
+        """Bring the mirror of the account up to date, for only the named
+        resources if resource_names is given. Returns a dictionary of
+        resource name to counts of the documents which were ``fetched``,
+        ``unchanged`` and ``deleted``, and ``failed``, a dictionary of the
+        ids of documents which could not be fetched to the error raised.
+        """
+        resources = self.get_resources()
+        if resource_names is None:
+            resource_names = sorted(resources)
+        report = {}
+        for name in resource_names:
+            report[name] = self._sync_resource(account_id, resources[name])
+        return report
+
+    def _sync_resource(self, account_id, resource):
+        stored_revisions = self.get_revisions(account_id, resource.name)
+        iter_method_name = resource.method_names.get(
+            "iter", "iter_{0}".format(resource.plural_name))
+        listed_ids = [record["id"] for record in
+                      self._call(iter_method_name, account_id,
+                                 page_size=self.page_size)]
+        result_counts = {"fetched": 0, "unchanged": 0, "deleted": 0,
+                         "failed": {}}
+        pool = WorkerPool(self.max_workers)
+        submit = lambda args: pool.submit(self._fetch_document, account_id,
+                                          resource, *args)
+        keyed_args = [(object_id, (object_id,
+                                   stored_revisions.get(object_id)))
+                      for object_id in listed_ids]
+        now = time.time()
+        try:
+            for result in iter_bulk_results(submit, keyed_args):
+                if not result.succeeded:
+                    result_counts["failed"][result.key] = result.error
+                elif self._is_unchanged(result.response,
+                                        stored_revisions.get(result.key)):
+                    result_counts["unchanged"] += 1
+                else:
+                    self._store_document(account_id, resource.name,
+                                         result.key, result.response, now)
+                    result_counts["fetched"] += 1
+        finally:
+            pool.shutdown(wait=False)
+        deleted_ids = set(stored_revisions) - set(listed_ids)
+        self.connection.executemany(
+            "DELETE FROM documents WHERE account_id = ? AND resource = ? "
+            "AND id = ?",
+            [(account_id, resource.name, object_id)
+             for object_id in deleted_ids])
+        result_counts["deleted"] = len(deleted_ids)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO syncs (account_id, resource, synced_at) "
+            "VALUES (?, ?, ?)", (account_id, resource.name, now))
+        self.connection.commit()
+        return result_counts
+
+    def _is_unchanged(self, response, stored_revision):
+        # Not modified, or a document fetched again because the server
+        # ignored If-None-Match. Documents without a revision are always
+        # stored, as there is no telling whether they changed.
+        if response is None:
+            return True
+        revision = get_revision(response)
+        return revision is not None and revision == stored_revision
+
+    def _fetch_document(self, account_id, resource, object_id, revision):
+        kwargs = {}
+        if revision is not None:
+            kwargs["if_none_match"] = '"{0}"'.format(revision)
+        return self._call(resource.method_names["object"], account_id,
+                          object_id, **kwargs)
+
+    def _call(self, method_name, *args, **kwargs):
+        result = getattr(self.client, method_name)(*args, **kwargs)
+        if isinstance(result, Future):
+            # The methods of an AsyncClient return futures
+            return result.result()
+        return result
+
+    def _store_document(self, account_id, resource_name, object_id, response,
+                        synced_at):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO documents (account_id, resource, id, "
+            "revision, data, synced_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (account_id, resource_name, object_id, get_revision(response),
+             json.dumps(response["data"]), synced_at))
+
+    def get_revisions(self, account_id, resource_name):
+        """The stored revision of each mirrored document of a resource, by
+        id
+        """
+        cursor = self.connection.execute(
+            "SELECT id, revision FROM documents WHERE account_id = ? AND "
+            "resource = ?", (account_id, resource_name))
+        return dict(cursor.fetchall())
+
+    def get_document(self, account_id, resource_name, object_id):
+        """The mirrored document, or None if it has not been mirrored"""
+        row = self.connection.execute(
+            "SELECT data FROM documents WHERE account_id = ? AND resource = ? "
+            "AND id = ?", (account_id, resource_name, object_id)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def iter_documents(self, account_id, resource_name):
+        cursor = self.connection.execute(
+            "SELECT data FROM documents WHERE account_id = ? AND resource = ? "
+            "ORDER BY id", (account_id, resource_name))
+        for row in cursor:
+            yield json.loads(row[0])
+
+    def get_last_sync_time(self, account_id, resource_name):
+        row = self.connection.execute(
+            "SELECT synced_at FROM syncs WHERE account_id = ? AND "
+            "resource = ?", (account_id, resource_name)).fetchone()
+        if row is None:
+            return None
+        return row[0]
@@ -0,0 +1,33 @@
+import json
+
+
+def iter_pages(get_page_request, submit, future=None):
+    """Yield the records from each page of a paginated list response.
+
+    get_page_request is called with the start key of the page (None for the
+    first page) and returns a request for it, submit takes that request and
+    returns a future for the response. future is the response to the first
+    page if it has already been submitted. The request for the next page is
+    submitted before the records of the current page are yielded so it can be
+    fetched in the background, at most two pages are held at once.
+    """
+    if future is None:
+        future = submit(get_page_request(None))
+    while future is not None:
+        response = future.result()
+        start_key = response.get("next_start_key")
+        if start_key is not None:
+            future = submit(get_page_request(encode_start_key(start_key)))
+        else:
+            future = None
+        for record in response["data"]:
+            yield record
+
+
+def encode_start_key(start_key):
+    """Kazoo returns compound start keys as JSON arrays, these must be sent
+    back JSON encoded
+    """
+    if isinstance(start_key, basestring):
+        return start_key
+    return json.dumps(start_key)
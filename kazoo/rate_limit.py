@@ -0,0 +1,69 @@
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Allows rate requests per second on average with bursts of up to burst
+    requests. Safe to share between threads, callers which are over the
+    limit reserve their slot and sleep until it arrives, so waiting threads
+    are released in turn at the configured rate.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.time, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(1, int(rate))
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, blocking until one is available"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens +
+                               (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            self._sleep(wait)
+
+
+class RateLimiter(object):
+    """Paces a client's requests with token buckets.
+
+    rate and burst limit all requests, method_limits and resource_limits map
+    http methods and rest resource names to ``(rate, burst)`` pairs for
+    separate buckets, for example
+    ``RateLimiter(rate=50, method_limits={"put": (5, 10)})``. A request
+    takes a token from every bucket which applies to it.
+    """
+
+    def __init__(self, rate=None, burst=None, method_limits=None,
+                 resource_limits=None, clock=time.time, sleep=time.sleep):
+        make_bucket = lambda rate, burst: TokenBucket(rate, burst,
+                                                      clock=clock,
+                                                      sleep=sleep)
+        self._bucket = None
+        if rate is not None:
+            self._bucket = make_bucket(rate, burst)
+        self._method_buckets = dict(
+            (method.lower(), make_bucket(*limit))
+            for method, limit in (method_limits or {}).items())
+        self._resource_buckets = dict(
+            (resource_name, make_bucket(*limit))
+            for resource_name, limit in (resource_limits or {}).items())
+
+    def acquire(self, method, resource_name=None):
+        if self._bucket is not None:
+            self._bucket.acquire()
+        if method.lower() in self._method_buckets:
+            self._method_buckets[method.lower()].acquire()
+        if resource_name in self._resource_buckets:
+            self._resource_buckets[resource_name].acquire()
@@ -1,31 +1,78 @@
 import base64
+import collections
 import json
 from kazoo import exceptions
+from kazoo.streaming import iter_response_records
 import hashlib
 import logging
+import os
 import re
-import requests
-import urllib
+import time
+import zlib
 
 logger = logging.getLogger(__name__)
 
+param_regex = re.compile("{([a-zA-Z0-9_]+)}")
+error_status_regex = re.compile(r'"status"\s*:\s*"error"')
+TRANSFER_CHUNK_SIZE = 64 * 1024
+
+
+class RawResponse(object):
+    """An undecoded API response, returned when a request is made with
+    ``raw=True``. content is the body as bytes, for streamed requests it is
+    read from the socket on first access, or iter_content can be used to
+    read it in chunks instead.
+
+    A gzip or deflate compressed body has already been decompressed by
+    requests, so its Content-Encoding and Content-Length headers, which
+    describe the compressed bytes, are left out of headers.
+    """
+
+    def __init__(self, raw_response):
+        self._raw_response = raw_response
+        self.status_code = raw_response.status_code
+        self.headers = get_decoded_headers(raw_response.headers)
+
+    @property
+    def content(self):
+        return self._raw_response.content
+
+    def iter_content(self, chunk_size=TRANSFER_CHUNK_SIZE):
+        return self._raw_response.iter_content(chunk_size)
+
 
 class KazooRequest(object):
     http_methods = ["get", "post", "put", "delete"]
+    unavailable_statuses = [429, 502, 503, 504]
 
-    def __init__(self, path, auth_required=True, method='get', get_params=None):
+    def __init__(self, path, auth_required=True, method='get', get_params=None,
+                 resource_name=None, collection_path=None,
+                 required_param_names=None, url_template=None):
         """An object which takes a path and determines required
         parameters from it, these parameters must be passed to the execute
         method of the object
+
+        resource_name and collection_path identify the rest resource the
+        request was built from, if any, they are used by response caching.
+        required_param_names skips parsing the path when the caller already
+        knows them. url_template is the path before its parameters were
+        filled in, for requests rendered from a :class:`RequestTemplate`.
         """
         self.path = path
-        self._required_param_names = self._get_params_from_path(self.path)
+        if required_param_names is None:
+            required_param_names = self._get_params_from_path(self.path)
+        self._required_param_names = required_param_names
         self.auth_required = auth_required
         self.method = method
         self.get_params = get_params
+        self.resource_name = resource_name
+        self.collection_path = collection_path
+        self._body_start = None
+        if url_template is None:
+            url_template = path
+        self.url_template = url_template
 
     def _get_params_from_path(self, path):
-        param_regex = re.compile("{([a-zA-Z0-9_]+)}")
         param_names = param_regex.findall(path)
         return param_names
 
@@ -35,16 +82,44 @@ class KazooRequest(object):
             headers["X-Auth-Token"] = token
         return headers
 
+    def get_relative_url(self, params):
+        """The path and query string this request will be made to"""
+        return self._get_url(params, "")
+
     def _get_url(self, params, base_url):
         url = base_url + self._get_url_with_variables_replaced(params)
         if self.get_params:
+            import urllib
             return url + "?" + urllib.urlencode(self.get_params)
         return url
 
     def _get_url_with_variables_replaced(self, params):
+        if not self._required_param_names:
+            return self.path
         return self.path.format(**params)
 
-    def execute(self, base_url, method=None, data=None, token=None, files=None, **kwargs):
+    def execute(self, base_url, method=None, data=None, token=None, files=None,
+                session=None, stream=False, if_none_match=None, trace=None,
+                raw=False, body=None, content_type=None, output=None,
+                compress_threshold=None, codec=None, **kwargs):
+        """Make the request, returning the decoded response, or a
+        :class:`RawResponse` if raw is true.
+
+        body is sent as is instead of JSON encoded data, with content_type
+        as its Content-Type. It may be a string or a seekable file, which is
+        read and sent in blocks rather than loaded into memory. If output is
+        a file the response body is written to it chunk by chunk and the
+        :class:`RawResponse` is returned, with its content already consumed.
+        If compress_threshold is given, JSON encoded data of at least that
+        many bytes is sent gzip compressed. If codec is a
+        :class:`kazoo.json_codecs.JsonCodec` it is used to encode data and
+        decode responses instead of the json module and requests.
+
+        If if_none_match is a revision and the server answers that the
+        document has not been modified then None is returned. If trace is a
+        :class:`kazoo.tracing.RequestTrace` the status, sizes and timings of
+        the request are added to it.
+        """
         if self.auth_required and token is None:
             error_message = ("This method requires an auth token, be sure to "
                              "call client.authenticate() before making API "
@@ -61,45 +136,237 @@ class KazooRequest(object):
                 raise ValueError("keyword argument {0} is required".format(
                     param_name))
         full_url = self._get_url(kwargs, base_url)
-        logger.debug("Making {0} request to url {1}".
-                     format(method, full_url.encode("utf-8")))
+        logger.debug("Making %s request to url %s", method, full_url)
         headers = self._get_headers(token=token)
-        req_func = getattr(requests, method)
+        if if_none_match is not None:
+            headers["If-None-Match"] = if_none_match
+        if session is None:
+            import requests as session
+        req_func = getattr(session, method)
         kwargs = {}
         if data:
-            kwargs["data"] = json.dumps({"data": data})
+            payload = (codec or json).dumps({"data": data})
+            if (compress_threshold is not None and
+                    len(payload) >= compress_threshold):
+                payload = gzip_compress(payload)
+                headers["Content-Encoding"] = "gzip"
+            kwargs["data"] = payload
+        if body is not None:
+            kwargs["data"] = self._prepare_body(body, content_type, headers)
         if files:
             kwargs["files"] = files
-        raw_response = req_func(full_url, headers=headers, **kwargs)
+        if output is not None:
+            raw = stream = True
+        if stream:
+            kwargs["prefetch"] = False
+        if trace is None:
+            raw_response = req_func(full_url, headers=headers, **kwargs)
+        else:
+            raw_response = self._send_traced(req_func, full_url, headers,
+                                             kwargs, method, stream, trace)
+        if if_none_match is not None and raw_response.status_code == 304:
+            return None
+        if raw:
+            response = self._get_raw_response(raw_response, stream, codec)
+            if output is not None:
+                for chunk in response.iter_content(TRANSFER_CHUNK_SIZE):
+                    output.write(chunk)
+            return response
+        if stream and raw_response.status_code == 200:
+            return iter_response_records(raw_response, self._handle_error,
+                                         loads=(codec or json).loads)
         if raw_response.status_code == 500:
-            self._handle_500_error(raw_response)
-        response = raw_response.json
+            self._handle_500_error(raw_response, codec)
+        if raw_response.status_code in self.unavailable_statuses:
+            self._handle_unavailable_error(raw_response)
+        if trace is None:
+            response = self._decode(raw_response, codec)
+        else:
+            decode_start = time.time()
+            response = self._decode(raw_response, codec)
+            trace.decode_time += time.time() - decode_start
         if response["status"] == "error":
-            logger.debug("There was an error, full error text is: {0}".format(
-                raw_response.content))
+            logger.debug("There was an error, full error text is: %s",
+                         raw_response.content)
             self._handle_error(response)
         return response
 
+    def _prepare_body(self, body, content_type, headers):
+        if hasattr(body, "seek"):
+            # The request may be sent again, after a token refresh or by a
+            # retry policy, so each attempt rewinds the file to where the
+            # first one started.
+            if self._body_start is None:
+                self._body_start = body.tell()
+            else:
+                body.seek(self._body_start)
+        length = get_body_length(body)
+        if length is None:
+            raise ValueError("body must be a string or a seekable file")
+        headers["Content-Type"] = content_type or "application/octet-stream"
+        headers["Content-Length"] = str(length)
+        return body
+
+    def _decode(self, raw_response, codec):
+        if codec is None:
+            return raw_response.json
+        return codec.decode_response(raw_response)
+
+    def _get_raw_response(self, raw_response, stream, codec=None):
+        # Errors are still raised, but the body of a successful response is
+        # only decoded if it might have an error status, and a streamed one
+        # is not read at all.
+        status_code = raw_response.status_code
+        if status_code == 500:
+            self._handle_500_error(raw_response, codec)
+        if status_code in self.unavailable_statuses:
+            self._handle_unavailable_error(raw_response)
+        if status_code >= 400 or (not stream and error_status_regex.search(
+                raw_response.content)):
+            response = self._decode(raw_response, codec)
+            if response and response.get("status") == "error":
+                self._handle_error(response)
+        return RawResponse(raw_response)
+
+    def _send_traced(self, req_func, url, headers, kwargs, method, stream,
+                     trace):
+        headers_received_at = []
+
+        def record_headers_received(response):
+            headers_received_at.append(time.time())
+            return response
+        trace.http_method = method
+        trace.url = url
+        trace.attempts += 1
+        trace.bytes_sent += get_body_length(kwargs.get("data") or "") or 0
+        kwargs["hooks"] = {"response": record_headers_received}
+        start = time.time()
+        raw_response = req_func(url, headers=headers, **kwargs)
+        end = time.time()
+        headers_received = headers_received_at[0] if headers_received_at \
+            else end
+        trace.wait_time += headers_received - start
+        trace.transfer_time += end - headers_received
+        trace.status_code = raw_response.status_code
+        if not stream:
+            trace.bytes_received += len(raw_response.content or "")
+        return raw_response
+
     def _handle_error(self, error_data):
         if error_data["error"] == "400" and ("data" in error_data):
             raise exceptions.KazooApiBadDataError(error_data["data"])
-        raise exceptions.KazooApiError("There was an error calling the kazoo api, "
-                                       "Request ID was {1}"
-                                       "the error was {0}".format(
-                                           error_data["message"],
-                                           error_data["request_id"],
-                                       ))
-
-    def _handle_500_error(self, raw_response):
+        if error_data["error"] == "401":
+            error_class = exceptions.KazooApiAuthenticationError
+        elif error_data["error"] == "404":
+            error_class = exceptions.KazooApiNotFoundError
+        else:
+            error_class = exceptions.KazooApiError
+        raise error_class("There was an error calling the kazoo api, "
+                          "Request ID was {1}"
+                          "the error was {0}".format(
+                              error_data["message"],
+                              error_data["request_id"],
+                          ))
+
+    def _handle_500_error(self, raw_response, codec=None):
         request_id = raw_response.headers["X-Request-Id"]
-        if raw_response.json:
-            message = raw_response.json["data"]
+        response = self._decode(raw_response, codec)
+        if response:
+            message = response["data"]
         else:
             message = "There was no error message"
-        raise exceptions.KazooApiError("Internal Server Error, "
-                                       "Request ID was {0}"
-                                       " message was {1}".format(
-                                           request_id, message))
+        raise exceptions.KazooApiUnavailableError(
+            "Internal Server Error, Request ID was {0} message was {1}".format(
+                request_id, message),
+            status_code=500,
+            retry_after=self._get_retry_after(raw_response))
+
+    def _handle_unavailable_error(self, raw_response):
+        raise exceptions.KazooApiUnavailableError(
+            "Kazoo API unavailable, status was {0}".format(
+                raw_response.status_code),
+            status_code=raw_response.status_code,
+            retry_after=self._get_retry_after(raw_response))
+
+    def _get_retry_after(self, raw_response):
+        try:
+            return int(raw_response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+
+def get_decoded_headers(headers):
+    """headers without those which no longer apply once requests has
+    decompressed the body they came with
+    """
+    encoding = (headers.get("Content-Encoding") or "").lower()
+    if "gzip" not in encoding and "deflate" not in encoding:
+        return headers
+    return type(headers)(
+        (name, value) for name, value in headers.items()
+        if name.lower() not in ("content-encoding", "content-length"))
+
+
+def gzip_compress(payload, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(payload) + compressor.flush()
+
+
+def get_body_length(body):
+    """The number of bytes left to send of a string or file request body, or
+    None if it can't be known without reading it
+    """
+    if isinstance(body, basestring):
+        return len(body)
+    try:
+        return os.fstat(body.fileno()).st_size - body.tell()
+    except (AttributeError, IOError, OSError):
+        pass
+    try:
+        position = body.tell()
+        body.seek(0, os.SEEK_END)
+        length = body.tell() - position
+        body.seek(position)
+        return length
+    except (AttributeError, IOError, OSError):
+        return None
+
+
+class RequestTemplate(collections.namedtuple(
+        "RequestTemplate", "path method resource_name collection_path "
+                           "path_format collection_format")):
+    """The path and method of the requests made by one method of a rest
+    resource, compiled once and rendered into a :class:`KazooRequest` with
+    the arguments of each call
+    """
+    __slots__ = ()
+
+    @classmethod
+    def compile(cls, path, method, resource_name=None, collection_path=None):
+        if collection_path is None:
+            collection_path = path
+        return cls(path, method, resource_name, collection_path,
+                   _compile_path_format(path),
+                   _compile_path_format(collection_path))
+
+    def render(self, params, get_params=None):
+        path = self.path_format % params
+        if self.collection_path == self.path:
+            collection_path = path
+        else:
+            collection_path = self.collection_format % params
+        return KazooRequest(path, method=self.method, get_params=get_params,
+                            resource_name=self.resource_name,
+                            collection_path=collection_path,
+                            required_param_names=(),
+                            url_template=self.path)
+
+
+def _compile_path_format(path):
+    """Convert a path with {param} placeholders to an equivalent % format
+    string, which is cheaper to render than str.format
+    """
+    return param_regex.sub(r"%(\1)s", path.replace("%", "%%"))
 
 
 class UsernamePasswordAuthRequest(KazooRequest):
@@ -111,20 +378,30 @@ class UsernamePasswordAuthRequest(KazooRequest):
         self.password = password
         self.account_name = account_name
 
-    def execute(self, base_url):
+    def execute(self, base_url, session=None):
         data = {
             "credentials": self._get_hashed_credentials(),
             "account_name": self.account_name,
         }
         return super(UsernamePasswordAuthRequest, self).execute(base_url,
                                                                 method="put",
-                                                                data=data)
+                                                                data=data,
+                                                                session=session)
 
     def _get_hashed_credentials(self):
         m = hashlib.md5()
         m.update("{0}:{1}".format(self.username, self.password))
         return m.hexdigest()
 
+    def get_credentials_key(self):
+        """An opaque key identifying these credentials, used to share auth
+        tokens between clients
+        """
+        m = hashlib.sha1()
+        m.update("user_auth:{0}:{1}".format(self.account_name,
+                                            self._get_hashed_credentials()))
+        return m.hexdigest()
+
 
 class ApiKeyAuthRequest(KazooRequest):
 
@@ -133,9 +410,18 @@ class ApiKeyAuthRequest(KazooRequest):
                                                 auth_required=False)
         self.api_key = api_key
 
-    def execute(self, base_url):
+    def execute(self, base_url, session=None):
         data = {
             "api_key": self.api_key
         }
         return super(ApiKeyAuthRequest, self).execute(base_url, data=data,
-                                                      method="put")
+                                                      method="put",
+                                                      session=session)
+
+    def get_credentials_key(self):
+        """An opaque key identifying this api key, used to share auth tokens
+        between clients
+        """
+        m = hashlib.sha1()
+        m.update("api_auth:{0}".format(self.api_key))
+        return m.hexdigest()
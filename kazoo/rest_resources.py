@@ -1,5 +1,4 @@
-from kazoo.request_objects import KazooRequest
-import re
+from kazoo.request_objects import RequestTemplate, param_regex
 
 method_types = ["detail", "list", "update", "create", "delete"]
 
@@ -9,7 +8,6 @@ class RestResource(object):
     def __init__(self, name, path, plural_name=None, extra_views=[],
                  methods=method_types, exclude_methods=[],
                  method_names={}):
-        self._param_regex = re.compile("{([a-zA-Z0-9_]+)}")
         self.name = name
         self._plural_name = plural_name
         self._check_at_least_one_argument(path)
@@ -19,6 +17,7 @@ class RestResource(object):
         self._initialize_extra_view_descriptions(extra_views)
         self._initialize_methods(methods, exclude_methods)
         self._initialize_method_names(method_names)
+        self._initialize_request_templates()
 
     def _initialize_method_names(self, given_method_names):
         self.method_names = {
@@ -27,8 +26,20 @@ class RestResource(object):
             "update": "update_{0}".format(self.name),
             "create": "create_{0}".format(self.name),
             "delete": "delete_{0}".format(self.name),
+            "bulk_create": "create_{0}".format(self.plural_name),
+            "bulk_update": "update_{0}".format(self.plural_name),
+            "bulk_delete": "delete_{0}".format(self.plural_name),
         }
         self.method_names.update(given_method_names)
+        for method_type in ["create", "update", "delete"]:
+            bulk_type = "bulk_" + method_type
+            if (method_type in self.methods and self.method_names[bulk_type]
+                    == self.method_names[method_type]):
+                raise ValueError("The {0} method of resource {1} has the "
+                                 "same name as its bulk variant, pass a "
+                                 "different name for {2} in "
+                                 "method_names".format(method_type,
+                                                       self.name, bulk_type))
 
     def _initialize_methods(self, methods, exclude_methods):
         self.methods = list(set(methods) - set(exclude_methods))
@@ -50,12 +61,12 @@ class RestResource(object):
         return self._get_params(path)[-1]
 
     def _get_params(self, path):
-        param_names = self._param_regex.findall(path)
+        param_names = param_regex.findall(path)
         return param_names
 
-    def _get_full_url(self, params):
-        object_id = params[self.object_arg]
-        return self.path.format(**params) + "/{0}".format(object_id)
+    @property
+    def _object_path(self):
+        return "{0}/{{{1}}}".format(self.path, self.object_arg)
 
     def _initialize_extra_view_descriptions(self, view_descs):
         self.extra_views = []
@@ -70,34 +81,46 @@ class RestResource(object):
                 result["method"] = "get"
             self.extra_views.append(result)
 
-    def get_list_request(self, **kwargs):
-        relative_path = self.path.format(**kwargs)
-        return KazooRequest(relative_path)
+    def _initialize_request_templates(self):
+        self._templates = {
+            "list": self._make_template(self.path, "get"),
+            "object": self._make_template(self._object_path, "get"),
+            "update": self._make_template(self._object_path, "post"),
+            "delete": self._make_template(self._object_path, "delete"),
+            "create": self._make_template(self.path, "put"),
+        }
+        self._extra_view_templates = {}
+        for view_desc in self.extra_views:
+            if view_desc["scope"] == "aggregate":
+                view_path = self.path + "/" + view_desc["path"]
+            else:
+                view_path = self._object_path + "/" + view_desc["path"]
+            self._extra_view_templates[view_desc["path"]] = \
+                self._make_template(view_path, view_desc["method"])
+
+    def _make_template(self, path, method):
+        return RequestTemplate.compile(path, method, self.name, self.path)
+
+    def get_list_request(self, get_params=None, **kwargs):
+        return self._templates["list"].render(kwargs, get_params=get_params)
 
     def get_object_request(self, **kwargs):
-        return KazooRequest(self._get_full_url(kwargs))
+        return self._templates["object"].render(kwargs)
 
     def get_update_object_request(self, **kwargs):
-        return KazooRequest(self._get_full_url(kwargs), method='post')
+        return self._templates["update"].render(kwargs)
 
     def get_delete_object_request(self, **kwargs):
-        return KazooRequest(self._get_full_url(kwargs), method='delete')
+        return self._templates["delete"].render(kwargs)
 
     def get_create_object_request(self, **kwargs):
-        return KazooRequest(self.path.format(**kwargs), method='put')
-
-    def get_extra_view_request(self, viewname, **kwargs):
-        view_desc = None
-        for desc in self.extra_views:
-            if desc["path"] == viewname:
-                view_desc = desc
-        if view_desc is None:
+        return self._templates["create"].render(kwargs)
+
+    def get_extra_view_request(self, viewname, get_params=None, **kwargs):
+        template = self._extra_view_templates.get(viewname)
+        if template is None:
             raise ValueError("Unknown extra view name {0}".format(viewname))
-        if view_desc["scope"] == "aggregate":
-            return KazooRequest(self.path.format(**kwargs) + "/" + viewname,
-                                method=view_desc["method"])
-        return KazooRequest(self._get_full_url(kwargs) + "/" + viewname,
-                            method=view_desc["method"])
+        return template.render(kwargs, get_params=get_params)
 
     @property
     def plural_name(self):
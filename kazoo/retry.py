@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from kazoo import exceptions
+
+
+def is_retryable(error):
+    """Whether a request which failed with error might succeed if retried"""
+    import requests
+    return isinstance(error, (exceptions.KazooApiUnavailableError,
+                              requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout))
+
+
+class RetryPolicy(object):
+    """Decides whether and when a failed request is retried.
+
+    method_retries maps http methods to the number of times a request with
+    that method may be retried, by default only get and delete requests,
+    which are safe to repeat, are retried. Retries back off exponentially
+    from backoff_factor seconds up to max_backoff seconds with full jitter,
+    unless the server sent a Retry-After delay, which is used instead. A
+    request whose Retry-After is longer than max_retry_after seconds is not
+    retried, so that workers are not left asleep for as long as the server
+    asks.
+    """
+
+    def __init__(self, method_retries=None, backoff_factor=0.1,
+                 max_backoff=10, max_retry_after=60, sleep=time.sleep,
+                 random=random.random):
+        if method_retries is None:
+            method_retries = {"get": 3, "delete": 3}
+        self.method_retries = method_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.sleep = sleep
+        self._random = random
+
+    def should_retry(self, method, retries, error):
+        if isinstance(error, exceptions.CircuitOpenError):
+            return False
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        return retries < self.method_retries.get(method.lower(), 0)
+
+    def get_backoff(self, retries, error):
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** retries))
+        return self._random() * backoff
+
+
+class CircuitBreaker(object):
+    """Tracks consecutive failures per host. After failure_threshold of them
+    the circuit for the host opens and requests fail immediately with
+    :class:`kazoo.exceptions.CircuitOpenError` for reset_timeout seconds,
+    after which a single trial request is let through. The circuit closes if
+    the trial succeeds and opens again if it fails.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30,
+                 clock=time.time):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = {}
+        self._opened_at = {}
+        self._trial_running = set()
+        self._lock = threading.Lock()
+
+    def before_request(self, host):
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            if (self._clock() - opened_at < self.reset_timeout or
+                    host in self._trial_running):
+                raise exceptions.CircuitOpenError(
+                    "Circuit open for {0} after {1} failures".format(
+                        host, self._failures[host]))
+            self._trial_running.add(host)
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_running.discard(host)
+
+    def record_failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if (host in self._trial_running or
+                    failures >= self.failure_threshold):
+                self._opened_at[host] = self._clock()
+            self._trial_running.discard(host)
+
+    def is_open(self, host):
+        with self._lock:
+            return host in self._opened_at
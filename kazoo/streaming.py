@@ -0,0 +1,132 @@
+import json
+import re
+
+STRUCTURAL_CHARS = re.compile(r'[\[\]{}",:]')
+STRING_CHARS = re.compile(r'["\\]')
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+
+class StreamingArrayParser(object):
+    """Incrementally extracts the elements of one array valued field of a
+    JSON object as the document is fed in chunk by chunk.
+
+    Each element is decoded as soon as its closing delimiter has been seen,
+    so only the element currently being read is held in memory. Top level
+    string fields of the enclosing object (status, message, request_id, ...)
+    are collected in :attr:`envelope`.
+    """
+
+    def __init__(self, key="data", loads=json.loads):
+        self.key = key
+        self._loads = loads
+        self.envelope = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_parts = None
+        self._last_string = None
+        self._pending_key = None
+        self._in_array = False
+        self._element_parts = None
+
+    def feed(self, chunk):
+        """Parse the next chunk of the document, returning the list of array
+        elements completed by it
+        """
+        items = []
+        string_start = 0
+        element_start = 0
+        pos = 0
+        length = len(chunk)
+        while pos < length:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+            if self._in_string:
+                match = STRING_CHARS.search(chunk, pos)
+                if match is None:
+                    break
+                index = match.start()
+                if match.group() == "\\":
+                    if index + 1 < length:
+                        pos = index + 2
+                    else:
+                        self._escape = True
+                        pos = length
+                    continue
+                self._in_string = False
+                if self._string_parts is not None:
+                    self._string_parts.append(chunk[string_start:index])
+                    self._end_string()
+                pos = index + 1
+                continue
+            match = STRUCTURAL_CHARS.search(chunk, pos)
+            if match is None:
+                break
+            char = match.group()
+            index = match.start()
+            pos = index + 1
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._string_parts = []
+                    string_start = pos
+            elif char in "{[":
+                if (char == "[" and self._depth == 1 and
+                        self._pending_key == self.key):
+                    self._in_array = True
+                    self._element_parts = []
+                    element_start = pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 1:
+                    self._end_element(chunk[element_start:index], items)
+                    self._in_array = False
+                    self._element_parts = None
+            elif char == ":":
+                if self._depth == 1:
+                    self._pending_key = self._last_string
+                    self._last_string = None
+            elif char == ",":
+                if self._depth == 1:
+                    self._pending_key = None
+                elif self._in_array and self._depth == 2:
+                    self._end_element(chunk[element_start:index], items)
+                    self._element_parts = []
+                    element_start = pos
+        if self._in_string and self._string_parts is not None:
+            self._string_parts.append(chunk[string_start:])
+        if self._in_array:
+            self._element_parts.append(chunk[element_start:])
+        return items
+
+    def _end_string(self):
+        value = json.loads('"' + "".join(self._string_parts) + '"')
+        self._string_parts = None
+        if self._pending_key is not None:
+            self.envelope[self._pending_key] = value
+        else:
+            self._last_string = value
+
+    def _end_element(self, last_part, items):
+        self._element_parts.append(last_part)
+        text = "".join(self._element_parts).strip()
+        if text:
+            items.append(self._loads(text))
+
+
+def iter_response_records(raw_response, handle_error,
+                          chunk_size=DEFAULT_CHUNK_SIZE, loads=json.loads):
+    """Yield the elements of the data array of a Kazoo response as they
+    are read from the socket, decoding each with loads. handle_error is
+    called with the envelope if the response turns out to have an error
+    status.
+    """
+    parser = StreamingArrayParser("data", loads)
+    for chunk in raw_response.iter_content(chunk_size):
+        for item in parser.feed(chunk):
+            yield item
+    if parser.envelope.get("status") == "error":
+        handle_error(parser.envelope)
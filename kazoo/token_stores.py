@@ -0,0 +1,104 @@
+import anydbm
+import json
+import os
+import tempfile
+import threading
+
+
+class MemoryTokenStore(object):
+    """Keeps authentication data in memory, so it can be shared by all of the
+    clients in a process which use the same credentials
+    """
+
+    def __init__(self):
+        self._auth_data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._auth_data.get(key)
+
+    def set(self, key, auth_data):
+        with self._lock:
+            self._auth_data[key] = auth_data
+
+    def delete(self, key):
+        with self._lock:
+            self._auth_data.pop(key, None)
+
+
+class FileTokenStore(object):
+    """Keeps authentication data in a JSON file so that it can be reused by
+    later processes. The file is replaced atomically on each write.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._read().get(key)
+
+    def set(self, key, auth_data):
+        with self._lock:
+            contents = self._read()
+            contents[key] = auth_data
+            self._write(contents)
+
+    def delete(self, key):
+        with self._lock:
+            contents = self._read()
+            if contents.pop(key, None) is not None:
+                self._write(contents)
+
+    def _read(self):
+        try:
+            with open(self.path) as token_file:
+                return json.load(token_file)
+        except (IOError, ValueError):
+            return {}
+
+    def _write(self, contents):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, "w") as temp_file:
+            json.dump(contents, temp_file)
+        os.rename(temp_path, self.path)
+
+
+class DbmTokenStore(object):
+    """Keeps authentication data in a local dbm key-value database, for
+    processes which already share one
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            db = anydbm.open(self.path, "c")
+            try:
+                if key not in db:
+                    return None
+                return json.loads(db[key])
+            finally:
+                db.close()
+
+    def set(self, key, auth_data):
+        with self._lock:
+            db = anydbm.open(self.path, "c")
+            try:
+                db[key] = json.dumps(auth_data)
+            finally:
+                db.close()
+
+    def delete(self, key):
+        with self._lock:
+            db = anydbm.open(self.path, "c")
+            try:
+                if key in db:
+                    del db[key]
+            finally:
+                db.close()
@@ -0,0 +1,88 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTrace(object):
+    """What happened during one call of a client method, passed to the
+    ``before_request`` and ``after_request`` methods of each of the client's
+    request hooks.
+
+    The request fields (resource_name, method_name, http_method,
+    url_template and url) are set before the request is sent. The remaining
+    fields are filled in as it runs, timings are in seconds and add up over
+    every HTTP request the call made, including retries and a request
+    repeated after the auth token was refreshed:
+
+    * wait_time - connecting, sending the request and waiting for the
+      response headers
+    * transfer_time - reading the response body
+    * decode_time - decoding the JSON response
+    * duration - the whole call, including any time spent in the cache,
+      rate limiter and retry backoff
+
+    attempts is the number of HTTP requests made, 0 if the response came
+    from the cache or, when coalesced is true, from an identical request
+    another thread was already making, and retries the number of times the
+    client's retry policy repeated the request. For streamed responses the
+    body is read after the call returns, so it is not included in
+    bytes_received or transfer_time.
+    """
+
+    def __init__(self, request, method_name=None, clock=time.time):
+        self.resource_name = request.resource_name
+        self.method_name = method_name
+        self.http_method = request.method
+        self.url_template = request.url_template
+        self.url = None
+        self.status_code = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wait_time = 0.0
+        self.transfer_time = 0.0
+        self.decode_time = 0.0
+        self.attempts = 0
+        self.retries = 0
+        self.coalesced = False
+        self.error = None
+        self._clock = clock
+        self.start_time = clock()
+        self.duration = None
+
+    def finish(self, error=None):
+        self.error = error
+        self.duration = self._clock() - self.start_time
+
+
+class LoggingRequestHook(object):
+    """A request hook which logs each request once it has completed, at
+    warning level if it took at least slow_threshold seconds and at debug
+    level otherwise. ::
+
+        >>>client = kazoo.Client(api_key="sdfasdfas",
+        ...                      request_hooks=[LoggingRequestHook(1.0)])
+    """
+
+    def __init__(self, slow_threshold=None, logger=logger):
+        self.slow_threshold = slow_threshold
+        self.logger = logger
+
+    def before_request(self, trace):
+        pass
+
+    def after_request(self, trace):
+        if (self.slow_threshold is not None and
+                trace.duration >= self.slow_threshold):
+            level = logging.WARNING
+        else:
+            level = logging.DEBUG
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(
+            level, "%s %s (%s) returned %s in %.3fs: wait %.3fs, transfer "
+            "%.3fs, decode %.3fs, %d bytes sent, %d bytes received, "
+            "%d attempts", trace.http_method.upper(), trace.url_template,
+            trace.method_name, trace.status_code, trace.duration,
+            trace.wait_time, trace.transfer_time, trace.decode_time,
+            trace.bytes_sent, trace.bytes_received, trace.attempts)
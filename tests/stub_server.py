@@ -0,0 +1,331 @@
+"""An in-process fake of the Kazoo API for benchmarks and stress tests.
+
+It serves /api_auth, /user_auth and every path of the rest resources
+declared on :class:`kazoo.Client`, keeping documents in memory. Documents
+which have not been written are generated on demand, so any id can be
+fetched. Binary attachments, paths ending in /raw or /docs/{name}, are
+stored as uploaded. JSON responses are gzip compressed when the client
+accepts it and compress_responses is set, and gzip request bodies are
+accepted.
+"""
+import BaseHTTPServer
+import SocketServer
+import hashlib
+import json
+import re
+import threading
+import urlparse
+import uuid
+import zlib
+from kazoo import Client
+from kazoo.request_objects import param_regex
+from kazoo.rest_resources import RestResource
+
+FILE_PATH_REGEX = re.compile(r"/(raw|docs/[^/]+)$")
+
+
+class StubKazooServer(object):
+    """Runs the fake API on a background thread. list_size and
+    descendants_size control how many records list and account descendant
+    requests return when the collection has not been written to.
+    set_cookie is sent as a Set-Cookie header with every JSON response, as
+    a load balancer with sticky sessions would. account_tree, a dictionary
+    of account id to the ids of its child accounts, is served by children
+    requests in place of generated records.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, list_size=50,
+                 descendants_size=1000, valid_tokens=None,
+                 compress_responses=False, set_cookie=None,
+                 account_tree=None):
+        self.list_size = list_size
+        self.descendants_size = descendants_size
+        self.routes = build_routes(Client)
+        self.documents = {}
+        self.files = {}
+        self.issued_tokens = set(valid_tokens or [])
+        self.compress_responses = compress_responses
+        self.set_cookie = set_cookie
+        self.account_tree = account_tree
+        self.request_count = 0
+        self.auth_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), StubRequestHandler)
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return "http://{0}:{1}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        args=(0.05,))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def issue_token(self):
+        with self.lock:
+            self.auth_count += 1
+            token = hashlib.md5(str(self.auth_count)).hexdigest()
+            self.issued_tokens.add(token)
+        return token
+
+    def revoke_tokens(self):
+        with self.lock:
+            self.issued_tokens.clear()
+
+    def get_document(self, path, object_id):
+        """Return the revision and contents of the document at path"""
+        with self.lock:
+            entry = self.documents.get(path)
+        if entry is None:
+            document = {"id": object_id, "name": "name " + object_id}
+            return "1-" + hashlib.md5(path).hexdigest(), document
+        return entry
+
+    def list_documents(self, collection_path, kind):
+        if kind == "children" and self.account_tree is not None:
+            account_id = collection_path.rsplit("/", 1)[1]
+            return [{"id": child_id, "name": child_id}
+                    for child_id in self.account_tree.get(account_id, [])]
+        with self.lock:
+            written = [document for path, (_, document)
+                       in self.documents.items()
+                       if path.rsplit("/", 1)[0] == collection_path]
+        if written:
+            return written
+        size = self.descendants_size if kind == "descendants" else \
+            self.list_size
+        return [{"id": "{0:032x}".format(index),
+                 "name": "record {0}".format(index)}
+                for index in range(size)]
+
+    def put_document(self, path, data):
+        with self.lock:
+            revision_number = 1
+            if path in self.documents:
+                revision = self.documents[path][0]
+                revision_number = int(revision.split("-")[0]) + 1
+            document = dict(data)
+            document["id"] = path.rsplit("/", 1)[1]
+            revision = "{0}-{1}".format(
+                revision_number, hashlib.md5(json.dumps(data)).hexdigest())
+            self.documents[path] = (revision, document)
+        return revision, document
+
+    def delete_document(self, path):
+        with self.lock:
+            self.documents.pop(path, None)
+
+    def get_file(self, path):
+        """The content type and contents of the file at path, or None"""
+        with self.lock:
+            return self.files.get(path)
+
+    def put_file(self, path, content_type, contents):
+        with self.lock:
+            self.files[path] = (content_type, contents)
+
+
+class ThreadingHTTPServer(SocketServer.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class StubRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer each response so it goes out in one write, small writes of the
+    # headers would otherwise be held back by Nagle's algorithm
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("get")
+
+    def do_PUT(self):
+        self._handle("put")
+
+    def do_POST(self):
+        self._handle("post")
+
+    def do_DELETE(self):
+        self._handle("delete")
+
+    def _handle(self, method):
+        stub = self.server.stub
+        with stub.lock:
+            stub.request_count += 1
+        url = urlparse.urlparse(self.path)
+        query = dict(urlparse.parse_qsl(url.query))
+        if FILE_PATH_REGEX.search(url.path):
+            return self._handle_file(stub, method, url.path)
+        body = self._read_body()
+        if url.path in ("/api_auth", "/user_auth") and method == "put":
+            response = _envelope({"account_id": "0" * 32})
+            response["auth_token"] = stub.issue_token()
+            return self._send(200, response)
+        if self.headers.getheader("X-Auth-Token") not in stub.issued_tokens:
+            return self._send_error(401, "invalid credentials")
+        route = match_route(stub.routes, url.path)
+        if route is None:
+            return self._send_error(404, "bad identifier")
+        kind, collection_path = route
+        if kind == "object":
+            return self._send_object(stub, method, url.path, body)
+        if kind == "list" and method == "put":
+            revision, document = stub.put_document(
+                url.path + "/" + uuid.uuid4().hex, body.get("data", {}))
+            return self._send(201, _envelope(document, revision))
+        if method == "get":
+            return self._send_list(stub, collection_path, kind, query)
+        return self._send(200, _envelope({}))
+
+    def _send_list(self, stub, collection_path, kind, query):
+        records = stub.list_documents(collection_path, kind)
+        response = {}
+        if "page_size" in query:
+            page_size = int(query["page_size"])
+            start = int(query.get("start_key", 0))
+            if start + page_size < len(records):
+                response["next_start_key"] = str(start + page_size)
+            records = records[start:start + page_size]
+        response.update(_envelope(records))
+        return self._send(200, response)
+
+    def _send_object(self, stub, method, path, body):
+        object_id = path.rsplit("/", 1)[1]
+        if method == "get":
+            revision, document = stub.get_document(path, object_id)
+            if self.headers.getheader("If-None-Match") == '"{0}"'.format(
+                    revision):
+                return self._send(304, None)
+            return self._send(200, _envelope(document, revision))
+        if method == "delete":
+            stub.delete_document(path)
+            return self._send(200, _envelope({}))
+        revision, document = stub.put_document(path, body.get("data", {}))
+        return self._send(200, _envelope(document, revision))
+
+    def _handle_file(self, stub, method, path):
+        contents = self.rfile.read(
+            int(self.headers.getheader("Content-Length") or 0))
+        if self.headers.getheader("X-Auth-Token") not in stub.issued_tokens:
+            return self._send_error(401, "invalid credentials")
+        if method in ("put", "post"):
+            stub.put_file(path, self.headers.getheader("Content-Type"),
+                          contents)
+            return self._send(200, _envelope({}))
+        entry = stub.get_file(path)
+        if entry is None:
+            return self._send_error(404, "bad identifier")
+        content_type, contents = entry
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(contents)))
+        self.end_headers()
+        self.wfile.write(contents)
+
+    def _read_body(self):
+        length = int(self.headers.getheader("Content-Length") or 0)
+        if not length:
+            return {}
+        body = self.rfile.read(length)
+        self._count_bytes("bytes_received", len(body))
+        if self.headers.getheader("Content-Encoding") == "gzip":
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        try:
+            return json.loads(body)
+        except ValueError:
+            return {}
+
+    def _count_bytes(self, counter, count):
+        stub = self.server.stub
+        with stub.lock:
+            setattr(stub, counter, getattr(stub, counter) + count)
+
+    def _send_error(self, status, message):
+        self._send(status, {"status": "error", "error": str(status),
+                            "message": message, "request_id": "stub",
+                            "auth_token": "", "data": {}})
+
+    def _send(self, status, response):
+        body = "" if response is None else json.dumps(response)
+        accept_encoding = self.headers.getheader("Accept-Encoding") or ""
+        compress = (body and self.server.stub.compress_responses and
+                    "gzip" in accept_encoding)
+        if compress:
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            body = compressor.compress(body) + compressor.flush()
+        self._count_bytes("bytes_sent", len(body))
+        self.send_response(status)
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Request-Id", "stub")
+        if self.server.stub.set_cookie is not None:
+            self.send_header("Set-Cookie", self.server.stub.set_cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _envelope(data, revision="undefined"):
+    return {"auth_token": "", "status": "success", "request_id": "stub",
+            "revision": revision, "data": data}
+
+
+def build_routes(client_class):
+    """Regexes for the paths of every rest resource declared on the client
+    class, paired with the kind of request they match. Extra views come
+    first so they are not mistaken for object ids.
+    """
+    view_routes = []
+    resource_routes = []
+    for value in vars(client_class).values():
+        if not isinstance(value, RestResource):
+            continue
+        object_path = "{0}/{{{1}}}".format(value.path, value.object_arg)
+        for view_desc in value.extra_views:
+            if view_desc["scope"] == "aggregate":
+                view_path = value.path + "/" + view_desc["path"]
+            else:
+                view_path = object_path + "/" + view_desc["path"]
+            view_routes.append((_path_regex(view_path), view_desc["path"]))
+        resource_routes.append((_path_regex(object_path), "object"))
+        resource_routes.append((_path_regex(value.path), "list"))
+    return view_routes + resource_routes
+
+
+def match_route(routes, path):
+    for regex, kind in routes:
+        if regex.match(path):
+            if kind == "list":
+                return "list", path
+            return kind, path.rsplit("/", 1)[0]
+    return None
+
+
+def _path_regex(path):
+    literals = param_regex.split(path)[::2]
+    pattern = "[^/]+".join(re.escape(literal) for literal in literals)
+    return re.compile("^" + pattern + "$")
@@ -0,0 +1,40 @@
+import mock
+import unittest
+from kazoo import AsyncClient, exceptions
+from kazoo.executor import Future
+
+
+class AsyncClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = AsyncClient(api_key="sdfasdf", max_workers=2)
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.client.session.get.return_value.status_code = 200
+        self.client.session.get.return_value.json = {"status": "success",
+                                                     "data": {"id": "1"}}
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_generated_method_returns_future(self):
+        future = self.client.get_callflow("acctid", "callflowid")
+        self.assertTrue(isinstance(future, Future))
+        self.assertEqual(future.result(timeout=5)["data"], {"id": "1"})
+        self.client.session.get.assert_called_with(
+            self.client.BASE_URL + "/accounts/acctid/callflows/callflowid",
+            headers=mock.ANY)
+
+    def test_errors_raised_from_result(self):
+        self.client.session.get.return_value.json = {
+            "status": "error", "error": "404", "message": "not found",
+            "request_id": "someid"}
+        future = self.client.get_callflow("acctid", "callflowid")
+        with self.assertRaises(exceptions.KazooApiError):
+            future.result(timeout=5)
+
+    def test_pool_size_defaults_to_max_workers(self):
+        with mock.patch('requests.session') as mock_session:
+            AsyncClient(api_key="sdfasdf", max_workers=25).session
+            config = mock_session.call_args[1]["config"]
+            self.assertEqual(config["pool_maxsize"], 25)
@@ -12,5 +12,6 @@ class AuthenticationTestCase(unittest.TestCase):
             mock_req_class.return_value = mock_req
             client = Client(api_key="dsfjasbfkasdf")
             client.authenticate()
-            mock_req.execute.assert_called_with(client.BASE_URL)
+            mock_req.execute.assert_called_with(client.BASE_URL,
+                                                session=client.session)
             self.assertEqual(client.auth_token, "authorizethis")
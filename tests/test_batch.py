@@ -0,0 +1,59 @@
+import mock
+import unittest
+from kazoo import Client, AsyncClient, exceptions
+
+
+def fake_get(url, headers=None):
+    response = mock.Mock()
+    response.status_code = 200
+    object_id = url.rsplit("/", 1)[1]
+    if object_id == "missing":
+        response.json = {"status": "error", "error": "404",
+                         "message": "not found", "request_id": "someid"}
+    else:
+        response.json = {"status": "success", "data": {"id": object_id}}
+    return response
+
+
+class ClientMapTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf")
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.client.session.get.side_effect = fake_get
+
+    def test_results_returned_in_order(self):
+        ids = [str(i) for i in range(50)]
+        results = self.client.map("get_device",
+                                  [("acctid", dev_id) for dev_id in ids],
+                                  max_workers=5)
+        self.assertEqual([r["data"]["id"] for r in results], ids)
+
+    def test_exceptions_returned_in_place(self):
+        results = self.client.map(self.client.get_device,
+                                  [("acctid", "1"), ("acctid", "missing"),
+                                   ("acctid", "3")])
+        self.assertEqual(results[0]["data"]["id"], "1")
+        self.assertTrue(isinstance(results[1], exceptions.KazooApiError))
+        self.assertEqual(results[2]["data"]["id"], "3")
+
+    def test_unknown_method_name_raises(self):
+        with self.assertRaises(AttributeError):
+            self.client.map("get_nonsense", [("acctid",)])
+
+
+class AsyncClientMapTestCase(unittest.TestCase):
+
+    def test_map_uses_client_worker_pool(self):
+        client = AsyncClient(api_key="sdfasdf", max_workers=3)
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.get.side_effect = fake_get
+        try:
+            results = client.map("get_device", [("acctid", "1"),
+                                                ("acctid", "missing")])
+        finally:
+            client.close()
+        self.assertEqual(results[0]["data"]["id"], "1")
+        self.assertTrue(isinstance(results[1], exceptions.KazooApiError))
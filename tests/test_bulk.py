@@ -0,0 +1,129 @@
+import json
+import mock
+import threading
+import time
+import unittest
+from kazoo import Client, AsyncClient, exceptions
+from kazoo.bulk import BulkReport, BulkResult
+from kazoo.rest_resources import RestResource
+
+
+def fake_write(url, headers=None, data=None):
+    response = mock.Mock()
+    response.status_code = 200
+    name = json.loads(data)["data"].get("name") if data else None
+    if name == "":
+        response.json = {"status": "error", "error": "400",
+                         "message": "invalid data", "request_id": "someid",
+                         "data": {"name": {"required": "Field is required"}}}
+    elif name == "conflict":
+        response.json = {"status": "error", "error": "409",
+                         "message": "conflict", "request_id": "someid"}
+    else:
+        response.json = {"status": "success",
+                         "data": {"id": url.rsplit("/", 1)[1]}}
+    return response
+
+
+def fake_delete(url, headers=None):
+    return fake_write(url, headers)
+
+
+class BulkMethodTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf")
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.client.session.put.side_effect = fake_write
+        self.client.session.post.side_effect = fake_write
+        self.client.session.delete.side_effect = fake_delete
+
+    def test_create_report(self):
+        report = self.client.create_devices(
+            "acctid", [{"name": "a"}, {"name": ""}, {"name": "conflict"},
+                       {"name": "b"}], max_workers=2)
+        self.assertEqual(sorted(r.key for r in report.succeeded), [0, 3])
+        self.assertEqual([r.key for r in report.invalid], [1])
+        self.assertEqual(report.invalid[0].field_errors,
+                         {"name": {"required": "Field is required"}})
+        self.assertEqual([r.key for r in report.failed], [2])
+        self.assertTrue(isinstance(report.failed[0].error,
+                                   exceptions.KazooApiError))
+        self.assertFalse(report.ok)
+        self.assertEqual(len(report), 4)
+
+    def test_update_accepts_dict_or_pairs(self):
+        report = self.client.update_callflows("acctid",
+                                              {"cf1": {"name": "a"}})
+        self.assertEqual(report.succeeded[0].response["data"]["id"], "cf1")
+        report = self.client.update_callflows("acctid",
+                                              [("cf2", {"name": "b"})])
+        self.assertEqual([r.key for r in report.succeeded], ["cf2"])
+        self.client.session.post.assert_called_with(
+            Client.BASE_URL + "/accounts/acctid/callflows/cf2",
+            headers=mock.ANY, data=json.dumps({"data": {"name": "b"}}))
+
+    def test_delete_streams_results(self):
+        ids = [str(i) for i in range(20)]
+        results = self.client.delete_callflows("acctid", ids, stream=True)
+        self.assertFalse(isinstance(results, BulkReport))
+        self.assertEqual(sorted(r.key for r in results if r.succeeded),
+                         sorted(ids))
+
+    def test_async_client_bulk_uses_worker_pool(self):
+        client = AsyncClient(api_key="sdfasdf", max_workers=3)
+        client.auth_token = "sometoken"
+        client.session = self.client.session
+        report = client.delete_callflows("acctid", ["1", "2", "3", "4"])
+        self.assertEqual(len(report.succeeded), 4)
+        client.close()
+
+    def test_async_client_bulk_honours_max_workers(self):
+        client = AsyncClient(api_key="sdfasdf", max_workers=4)
+        client.auth_token = "sometoken"
+        client.session = self.client.session
+        lock = threading.Lock()
+        running = []
+        most_running = []
+
+        def slow_delete(url, headers=None):
+            with lock:
+                running.append(url)
+                most_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(url)
+            return fake_delete(url, headers)
+        client.session.delete.side_effect = slow_delete
+        report = client.delete_callflows("acctid", ["1", "2", "3", "4"],
+                                         max_workers=2)
+        client.close()
+        self.assertEqual(len(report.succeeded), 4)
+        self.assertLessEqual(max(most_running), 2)
+
+
+class BulkMethodNamesTestCase(unittest.TestCase):
+
+    def test_bulk_names_use_plural(self):
+        self.assertTrue(hasattr(Client, "create_devices"))
+        self.assertTrue(hasattr(Client, "delete_voicemail_boxes"))
+        self.assertTrue(hasattr(Client, "create_media_items"))
+        self.assertFalse(hasattr(Client, "create_limits"))
+
+    def test_bulk_name_colliding_with_single_method_raises(self):
+        with self.assertRaises(ValueError):
+            RestResource("fish", "/{account_id}/fish/{fish_id}",
+                         plural_name="fish")
+
+    def test_collision_allowed_for_missing_methods(self):
+        RestResource("fish", "/{account_id}/fish/{fish_id}",
+                     plural_name="fish", methods=["list", "detail"])
+
+
+class BulkResultTestCase(unittest.TestCase):
+
+    def test_field_errors_only_for_bad_data(self):
+        result = BulkResult(1, error=exceptions.KazooApiError("failed"))
+        self.assertIsNone(result.field_errors)
+        self.assertFalse(result.succeeded)
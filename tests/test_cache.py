@@ -0,0 +1,191 @@
+import mock
+import requests
+import unittest
+from kazoo import Client, exceptions
+from kazoo.cache import ResponseCache
+from tests.utils import FakeClock
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(max_size=3, ttl=10,
+                                   resource_ttls={"callflow": 100},
+                                   clock=self.clock)
+
+    def test_get_returns_set_response(self):
+        self.cache.set("/a", {"data": 1})
+        self.assertEqual(self.cache.get("/a"), {"data": 1})
+        self.assertEqual(self.cache.get("/b"), None)
+
+    def test_entries_expire(self):
+        self.cache.set("/a", {"data": 1})
+        self.clock.now += 11
+        self.assertEqual(self.cache.get("/a"), None)
+
+    def test_resource_ttl_overrides_default(self):
+        self.cache.set("/a", {"data": 1}, resource_name="callflow")
+        self.clock.now += 50
+        self.assertEqual(self.cache.get("/a"), {"data": 1})
+
+    def test_least_recently_used_evicted(self):
+        for key in ["/a", "/b", "/c"]:
+            self.cache.set(key, key)
+        self.cache.get("/a")
+        self.cache.set("/d", "/d")
+        self.assertEqual(self.cache.get("/b"), None)
+        self.assertEqual(self.cache.get("/a"), "/a")
+        self.assertEqual(len(self.cache), 3)
+
+    def test_object_write_invalidates_object_views_and_lists(self):
+        cache = ResponseCache()
+        keys = ["/accts/1/cfs", "/accts/1/cfs?page_size=10",
+                "/accts/1/cfs/x", "/accts/1/cfs/x/view", "/accts/1/cfs/xy",
+                "/accts/1/cfs/status", "/accts/1"]
+        for key in keys:
+            cache.set(key, key)
+        cache.invalidate("/accts/1/cfs/x", "/accts/1/cfs")
+        remaining = [key for key in keys if cache.get(key) is not None]
+        self.assertEqual(remaining, ["/accts/1/cfs/xy", "/accts/1/cfs/status",
+                                     "/accts/1"])
+
+    def test_create_invalidates_only_lists(self):
+        cache = ResponseCache()
+        cache.set("/accts/1/cfs", 1)
+        cache.set("/accts/1/cfs/x", 2)
+        cache.invalidate("/accts/1/cfs", "/accts/1/cfs")
+        self.assertEqual(cache.get("/accts/1/cfs"), None)
+        self.assertEqual(cache.get("/accts/1/cfs/x"), 2)
+
+    def test_write_without_resource_invalidates_path(self):
+        cache = ResponseCache()
+        cache.set("/numbers/1", 1)
+        cache.set("/numbers/12", 2)
+        cache.invalidate("/numbers/1")
+        self.assertEqual(cache.get("/numbers/1"), None)
+        self.assertEqual(cache.get("/numbers/12"), 2)
+
+
+class ClientCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf", cache=ResponseCache())
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        for method in ["get", "post", "put", "delete"]:
+            response = getattr(self.client.session, method).return_value
+            response.status_code = 200
+            response.json = {"status": "success", "data": {}}
+
+    def test_repeated_get_served_from_cache(self):
+        first = self.client.get_callflow("acctid", "cfid")
+        second = self.client.get_callflow("acctid", "cfid")
+        self.assertTrue(first is second)
+        self.assertEqual(self.client.session.get.call_count, 1)
+
+    def test_update_invalidates_cached_object(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.client.get_callflows("acctid")
+        self.client.update_callflow("acctid", "cfid", {"name": "new"})
+        self.client.get_callflow("acctid", "cfid")
+        self.client.get_callflows("acctid")
+        self.assertEqual(self.client.session.get.call_count, 4)
+
+    def test_streamed_requests_not_cached(self):
+        self.client.session.get.return_value.iter_content.return_value = []
+        list(self.client.get_callflows("acctid", stream=True))
+        list(self.client.get_callflows("acctid", stream=True))
+        self.assertEqual(self.client.session.get.call_count, 2)
+
+
+class RevalidationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=10, clock=self.clock)
+        self.client = Client(api_key="sdfasdf", cache=self.cache)
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.response = self.client.session.get.return_value
+        self.response.status_code = 200
+        self.response.json = {"status": "success", "data": {"id": "cfid"},
+                              "revision": "1-abc"}
+
+    def test_expired_entry_revalidated_with_revision(self):
+        first = self.client.get_callflow("acctid", "cfid")
+        self.clock.now += 11
+        self.response.status_code = 304
+        second = self.client.get_callflow("acctid", "cfid")
+        self.assertTrue(first is second)
+        headers = self.client.session.get.call_args[1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"1-abc"')
+
+    def test_not_modified_renews_entry(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.clock.now += 11
+        self.response.status_code = 304
+        self.client.get_callflow("acctid", "cfid")
+        self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(self.client.session.get.call_count, 2)
+
+    def test_callers_revision_ignored_without_cached_response(self):
+        response = self.client.get_callflow("acctid", "cfid",
+                                            if_none_match='"1-abc"')
+        self.assertEqual(response["revision"], "1-abc")
+        headers = self.client.session.get.call_args[1]["headers"]
+        self.assertNotIn("If-None-Match", headers)
+        self.assertTrue(self.cache.get("/accounts/acctid/callflows/cfid")
+                        is response)
+
+    def test_modified_entry_replaced(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.clock.now += 11
+        self.response.json = {"status": "success", "data": {"id": "cfid"},
+                              "revision": "2-def"}
+        response = self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(response["revision"], "2-def")
+
+    def test_revalidate_cache_reports_changed_keys(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.client.get_callflow("acctid", "other")
+        self.cache.set("/accounts/acctid/callflows/other",
+                       {"status": "success", "revision": "0-old"})
+
+        def fake_get(url, headers=None):
+            response = mock.Mock()
+            if headers["If-None-Match"] == '"1-abc"':
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response.json = {"status": "success", "revision": "1-new"}
+            return response
+        self.client.session.get.side_effect = fake_get
+        changed = self.client.revalidate_cache()
+        self.assertEqual(changed, ["/accounts/acctid/callflows/other"])
+
+    def test_revalidate_cache_removes_missing_documents(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.response.status_code = 404
+        self.response.json = {"status": "error", "error": "404",
+                              "message": "not found", "request_id": "id"}
+        changed = self.client.revalidate_cache()
+        self.assertEqual(changed, ["/accounts/acctid/callflows/cfid"])
+        self.assertEqual(len(self.cache), 0)
+
+    def test_revalidate_cache_keeps_entries_when_unavailable(self):
+        self.client.get_callflow("acctid", "cfid")
+        self.response.status_code = 503
+        self.response.headers = {}
+        with self.assertRaises(exceptions.KazooApiUnavailableError):
+            self.client.revalidate_cache()
+        self.assertEqual(len(self.cache), 1)
+
+    def test_revalidate_cache_reports_errors_separately(self):
+        self.client.get_callflow("acctid", "cfid")
+        error = requests.exceptions.ConnectionError("refused")
+        self.client.session.get.side_effect = error
+        errors = {}
+        self.assertEqual(self.client.revalidate_cache(errors=errors), [])
+        self.assertEqual(errors, {"/accounts/acctid/callflows/cfid": error})
+        self.assertEqual(len(self.cache), 1)
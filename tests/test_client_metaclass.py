@@ -46,6 +46,20 @@ class MetaclassMethodCreationTestCase(unittest.TestCase):
             self.test_resource.get_some_resources)
         self.assertEqual(args, ["self", "resource_one_id"])
 
+    def test_generated_methods_accept_request_options(self):
+        _, _, varkw, _ = inspect.getargspec(
+            self.test_resource.get_some_resources)
+        self.assertEqual(varkw, "options")
+
+    def test_list_iterator_has_page_size_argument(self):
+        args, _, _, defaults = inspect.getargspec(
+            self.test_resource.iter_some_resources)
+        self.assertEqual(args, ["self", "resource_one_id", "page_size"])
+        self.assertEqual(defaults, (50,))
+
+    def test_list_iterator_not_created_without_list_method(self):
+        self.assertFalse(hasattr(self.test_resource, "iter_auctions"))
+
     def test_get_single_resource_has_object_id_as_argument(self):
         self._assert_resource_id_arguments("get_some_resource")
 
@@ -0,0 +1,65 @@
+import mock
+import threading
+import unittest
+from kazoo import Client
+from tests.utils import wait_until
+
+
+class CoalescingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf", coalesce_requests=True)
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.release = threading.Event()
+        self.responses = []
+        self.sent = []
+        lock = threading.Lock()
+
+        def get(url, **kwargs):
+            with lock:
+                self.sent.append(url)
+            self.release.wait()
+            response = mock.Mock()
+            response.status_code = 200
+            response.json = {"status": "success", "data": {"url": url}}
+            return response
+        self.client.session.get.side_effect = get
+
+    def call_in_threads(self, calls):
+        def call(args):
+            self.responses.append(self.client.get_device(*args))
+        threads = [threading.Thread(target=call, args=(args,))
+                   for args in calls]
+        for thread in threads:
+            thread.start()
+        # Every thread has either sent its request or is waiting for one
+        # which is in flight
+        wait_until(lambda: len(self.sent) + self.client._in_flight.waiting ==
+                   len(calls))
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_identical_gets_sent_once(self):
+        self.call_in_threads([("acctid", "deviceid")] * 5)
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(len(self.responses), 5)
+        self.assertTrue(all(response is self.responses[0]
+                            for response in self.responses))
+
+    def test_different_urls_sent_separately(self):
+        self.call_in_threads([("acctid", "device1"), ("acctid", "device2")])
+        self.assertEqual(len(self.sent), 2)
+
+    def test_writes_and_streams_not_coalesced(self):
+        request = mock.Mock(method="get")
+        for kwargs in [{"method": "put"}, {"stream": True}, {"raw": True}]:
+            self.assertIsNone(self.client._get_coalescing_key(request,
+                                                              kwargs))
+
+    def test_disabled(self):
+        self.assertFalse(Client(api_key="sdfasdf").coalesce_requests)
+        self.client.coalesce_requests = False
+        self.call_in_threads([("acctid", "deviceid")] * 3)
+        self.assertEqual(len(self.sent), 3)
@@ -0,0 +1,74 @@
+import json
+import mock
+import unittest
+import zlib
+import kazoo
+from kazoo.request_objects import KazooRequest
+from tests.stub_server import StubKazooServer
+
+
+class RequestCompressionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.request = KazooRequest("/somepath", auth_required=False,
+                                    method="post")
+        self.session = mock.Mock()
+        self.session.post.return_value.status_code = 200
+        self.session.post.return_value.json = {"status": "success"}
+
+    def sent(self):
+        return self.session.post.call_args[1]
+
+    def test_large_body_compressed(self):
+        data = {"numbers": ["+1415555{0:04d}".format(i) for i in range(100)]}
+        self.request.execute("http://testserver", data=data,
+                             session=self.session, compress_threshold=1024)
+        kwargs = self.sent()
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        decoded = zlib.decompress(kwargs["data"], 16 + zlib.MAX_WBITS)
+        self.assertEqual(json.loads(decoded), {"data": data})
+
+    def test_small_body_left_alone(self):
+        self.request.execute("http://testserver", data={"name": "desk"},
+                             session=self.session, compress_threshold=1024)
+        kwargs = self.sent()
+        self.assertNotIn("Content-Encoding", kwargs["headers"])
+        self.assertEqual(json.loads(kwargs["data"]),
+                         {"data": {"name": "desk"}})
+
+
+class CompressedResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(compress_responses=True,
+                                    descendants_size=200).start()
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+
+    def make_client(self, **kwargs):
+        self.client = kazoo.Client(api_key="key", **kwargs)
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+        return self.client
+
+    def test_compressed_responses_decoded(self):
+        client = self.make_client()
+        before = self.stub.bytes_sent
+        response = client.get_account_descendants("acct")
+        self.assertEqual(len(response["data"]), 200)
+        compressed_size = self.stub.bytes_sent - before
+        streamed = list(client.get_account_descendants("acct", stream=True))
+        self.assertEqual(streamed, response["data"])
+        client.close()
+        client = self.make_client(accept_encoding="identity")
+        before = self.stub.bytes_sent
+        self.assertEqual(client.get_account_descendants("acct"), response)
+        self.assertGreater(self.stub.bytes_sent - before, compressed_size)
+
+    def test_compressed_request_body_accepted(self):
+        client = self.make_client(request_compression_threshold=0)
+        created = client.create_device("acct", {"name": "desk"})
+        device = client.get_device("acct", created["data"]["id"])
+        self.assertEqual(device["data"]["name"], "desk")
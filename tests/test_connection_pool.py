@@ -0,0 +1,60 @@
+import mock
+import unittest
+from kazoo import Client
+from kazoo.request_objects import KazooRequest
+
+
+class ClientConnectionPoolTestCase(unittest.TestCase):
+
+    def test_pool_configuration_passed_to_session(self):
+        with mock.patch('requests.session') as mock_session:
+            client = Client(api_key="sdfasdf", pool_connections=3,
+                            pool_maxsize=40, keep_alive=False)
+            self.assertFalse(mock_session.called)
+            self.assertEqual(client.session, mock_session.return_value)
+            mock_session.assert_called_with(config={
+                "pool_connections": 3,
+                "pool_maxsize": 40,
+                "keep_alive": False,
+                "store_cookies": False,
+            })
+
+    def test_generated_methods_use_client_session(self):
+        client = Client(api_key="sdfasdf")
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.get.return_value.status_code = 200
+        client.session.get.return_value.json = {"status": "success"}
+        client.get_callflow("acctid", "callflowid")
+        client.session.get.assert_called_with(
+            client.BASE_URL + "/accounts/acctid/callflows/callflowid",
+            headers=mock.ANY)
+
+    def test_close_without_session_does_not_create_one(self):
+        with mock.patch('requests.session') as mock_session:
+            Client(api_key="sdfasdf").close()
+            self.assertFalse(mock_session.called)
+
+    def test_close_closes_session(self):
+        client = Client(api_key="sdfasdf")
+        client.session = mock.Mock()
+        client.close()
+        client.session.close.assert_called_with()
+
+    def test_context_manager_closes_session(self):
+        with Client(api_key="sdfasdf") as client:
+            client.session = mock.Mock()
+        client.session.close.assert_called_with()
+
+
+class RequestSessionTestCase(unittest.TestCase):
+
+    def test_session_used_instead_of_module_functions(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        session = mock.Mock()
+        session.get.return_value.json = {"status": "success"}
+        with mock.patch('requests.get') as mock_get:
+            request.execute("http://testserver", session=session)
+            self.assertFalse(mock_get.called)
+        session.get.assert_called_with("http://testserver/somepath",
+                                       headers=mock.ANY)
@@ -0,0 +1,132 @@
+import json
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+from kazoo import Client, AsyncClient, exceptions
+from tests.stub_server import StubKazooServer
+
+TREE = {
+    "root": ["a", "b"],
+    "a": ["a1", "a2"],
+    "b": ["b1"],
+    "a1": ["a11"],
+}
+
+
+def fake_get(url, headers=None):
+    response = mock.Mock()
+    response.status_code = 200
+    account_id = url.rsplit("/", 2)[1]
+    if account_id == "broken":
+        response.json = {"status": "error", "error": "500",
+                         "message": "failed", "request_id": "someid"}
+    else:
+        response.json = {"status": "success",
+                         "data": [{"id": child_id, "name": child_id}
+                                  for child_id in TREE.get(account_id, [])]}
+    return response
+
+
+class CrawlAccountsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf")
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.client.session.get.side_effect = fake_get
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpoint_path = os.path.join(self.temp_dir, "crawl.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_crawls_breadth_first(self):
+        accounts = self.client.crawl_accounts("root", max_workers=1)
+        self.assertEqual([account["id"] for account in accounts],
+                         ["a", "b", "a1", "a2", "b1", "a11"])
+        self.client.session.get.assert_any_call(
+            Client.BASE_URL + "/accounts/a1/children", headers=mock.ANY)
+
+    def test_concurrent_crawl_finds_every_account(self):
+        accounts = self.client.crawl_accounts("root", max_workers=4)
+        self.assertEqual(sorted(account["id"] for account in accounts),
+                         ["a", "a1", "a11", "a2", "b", "b1"])
+
+    def test_interrupted_crawl_resumes_from_checkpoint(self):
+        accounts = self.client.crawl_accounts(
+            "root", max_workers=1, checkpoint_path=self.checkpoint_path)
+        seen = [next(accounts)["id"], next(accounts)["id"],
+                next(accounts)["id"]]
+        accounts.close()
+        with open(self.checkpoint_path) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)["frontier"],
+                             ["a", "b"])
+        resumed = self.client.crawl_accounts(
+            "root", max_workers=1, checkpoint_path=self.checkpoint_path)
+        seen.extend(account["id"] for account in resumed)
+        self.assertEqual(set(seen), set(["a", "b", "a1", "a2", "b1", "a11"]))
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_checkpoint_saved_when_request_fails(self):
+        TREE["b"] = ["broken"]
+        try:
+            accounts = self.client.crawl_accounts(
+                "b", max_workers=1, checkpoint_path=self.checkpoint_path)
+            with self.assertRaises(exceptions.KazooApiError):
+                list(accounts)
+        finally:
+            TREE["b"] = ["b1"]
+        with open(self.checkpoint_path) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)["frontier"],
+                             ["broken"])
+
+    def test_checkpoint_for_other_root_rejected(self):
+        with open(self.checkpoint_path, "w") as checkpoint_file:
+            json.dump({"root_account_id": "other", "frontier": []},
+                      checkpoint_file)
+        with self.assertRaises(ValueError):
+            list(self.client.crawl_accounts(
+                "root", checkpoint_path=self.checkpoint_path))
+
+    def test_async_client_crawls_on_worker_pool(self):
+        client = AsyncClient(api_key="sdfasdf", max_workers=2)
+        client.auth_token = "sometoken"
+        client.session = self.client.session
+        accounts = list(client.crawl_accounts("a"))
+        self.assertEqual(sorted(account["id"] for account in accounts),
+                         ["a1", "a11", "a2"])
+        client.close()
+
+
+class PaginatedCrawlTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tree = {"root": ["child{0}".format(index) for index in range(7)],
+                "child3": ["grandchild{0}".format(index)
+                           for index in range(5)]}
+        self.expected = sorted(tree["root"] + tree["child3"])
+        self.stub = StubKazooServer(account_tree=tree).start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def test_every_page_of_children_crawled(self):
+        client = Client(api_key="key")
+        client.BASE_URL = self.stub.base_url
+        client.authenticate()
+        accounts = list(client.crawl_accounts("root", max_workers=3,
+                                              page_size=2))
+        client.close()
+        self.assertEqual(sorted(account["id"] for account in accounts),
+                         self.expected)
+
+    def test_async_client_crawls_every_page(self):
+        client = AsyncClient(api_key="key", max_workers=3)
+        client.BASE_URL = self.stub.base_url
+        client.authenticate()
+        accounts = list(client.crawl_accounts("root", page_size=2))
+        client.close()
+        self.assertEqual(sorted(account["id"] for account in accounts),
+                         self.expected)
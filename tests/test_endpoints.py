@@ -0,0 +1,120 @@
+import mock
+import time
+import unittest
+import kazoo
+from kazoo.endpoints import EndpointPool
+from kazoo.retry import RetryPolicy
+from tests.stub_server import StubKazooServer
+
+URLS = ["http://node1/v1", "http://node2/v1", "http://node3/v1"]
+
+
+class EndpointPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.probe = mock.Mock(return_value=False)
+        self.pool = EndpointPool(URLS, probe=self.probe, probe_interval=60)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def send(self, latency=0.01, failed=False):
+        endpoint = self.pool.acquire()
+        self.pool.release(endpoint, latency, failed)
+        return endpoint.base_url
+
+    def test_idle_nodes_take_turns(self):
+        self.assertEqual(sorted(self.send() for _ in range(3)), URLS)
+
+    def test_least_busy_node_chosen(self):
+        busy = [self.pool.acquire(), self.pool.acquire()]
+        self.assertNotIn(self.pool.acquire(), busy)
+
+    def test_ewma_prefers_faster_node(self):
+        pool = EndpointPool(URLS[:2], strategy="ewma")
+        for endpoint, latency in zip(pool.endpoints, [0.5, 0.01]):
+            endpoint.latency = latency
+        for _ in range(5):
+            endpoint = pool.acquire()
+            pool.release(endpoint, endpoint.latency)
+            self.assertEqual(endpoint.base_url, URLS[1])
+
+    def test_failing_node_ejected(self):
+        node = self.pool.endpoints[0]
+        for _ in range(3):
+            node.in_flight += 1
+            self.pool.release(node, 0.01, failed=True)
+        self.assertFalse(node.healthy)
+        self.assertNotIn(URLS[0], [self.send() for _ in range(6)])
+
+    def test_all_nodes_ejected_still_used(self):
+        for endpoint in self.pool.endpoints:
+            endpoint.ejected_at = 0
+        self.assertEqual(sorted(self.send() for _ in range(3)), URLS)
+
+    def test_probe_lets_node_back_in(self):
+        node = self.pool.endpoints[0]
+        node.ejected_at = 0
+        self.assertEqual(self.pool.probe_ejected(), 1)
+        self.probe.return_value = True
+        self.assertEqual(self.pool.probe_ejected(), 0)
+        self.probe.assert_called_with(URLS[0])
+        self.assertTrue(node.healthy)
+
+    def test_ejected_node_probed_in_background(self):
+        probe = mock.Mock(return_value=True)
+        pool = EndpointPool(URLS, failure_threshold=1, probe=probe,
+                            probe_interval=0.01)
+        node = pool.endpoints[0]
+        node.in_flight += 1
+        pool.release(node, 0.01, failed=True)
+        deadline = time.time() + 5
+        while not node.healthy and time.time() < deadline:
+            time.sleep(0.01)
+        pool.close()
+        self.assertTrue(node.healthy)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, EndpointPool, [])
+        self.assertRaises(ValueError, EndpointPool, URLS, strategy="random")
+
+
+class ClientEndpointPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stubs = [StubKazooServer().start(), StubKazooServer().start()]
+        self.stubs[1].issued_tokens = self.stubs[0].issued_tokens
+        self.client = kazoo.Client(
+            api_key="key", base_urls=[stub.base_url for stub in self.stubs],
+            retry_policy=RetryPolicy(sleep=lambda seconds: None))
+        self.client.authenticate()
+
+    def tearDown(self):
+        self.client.close()
+        for stub in self.stubs:
+            stub.stop()
+
+    def test_requests_spread_over_nodes(self):
+        before = [stub.request_count for stub in self.stubs]
+        for _ in range(10):
+            self.client.get_device("acct", "deviceid")
+        self.assertEqual([stub.request_count - count
+                          for stub, count in zip(self.stubs, before)],
+                         [5, 5])
+
+    def test_client_closes_only_its_own_pool(self):
+        self.client.close()
+        self.assertTrue(self.client.endpoint_pool.closed)
+        pool = EndpointPool(URLS)
+        for _ in range(2):
+            kazoo.Client(api_key="key", endpoint_pool=pool).close()
+        self.assertFalse(pool.closed)
+        pool.close()
+
+    def test_requests_moved_off_stopped_node(self):
+        self.stubs[1].stop()
+        for _ in range(10):
+            self.client.get_device("acct", "deviceid")
+        stopped = self.client.endpoint_pool.endpoints[1]
+        self.assertFalse(stopped.healthy)
+        self.stubs.pop()
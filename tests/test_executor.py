@@ -0,0 +1,149 @@
+import sys
+import threading
+import unittest
+from kazoo.executor import Future, SingleFlight, WorkerPool
+from tests.utils import wait_until
+
+
+class FutureTestCase(unittest.TestCase):
+
+    def test_result_returned(self):
+        future = Future()
+        future.set_result("someresult")
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), "someresult")
+        self.assertEqual(future.exception(), None)
+
+    def test_exception_reraised(self):
+        future = Future()
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            future.set_exception_info(sys.exc_info())
+        with self.assertRaises(ValueError):
+            future.result()
+        self.assertTrue(isinstance(future.exception(), ValueError))
+
+    def test_result_times_out_if_not_done(self):
+        future = Future()
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=0.01)
+
+    def test_callback_called_on_completion(self):
+        future = Future()
+        seen = []
+        future.add_done_callback(seen.append)
+        self.assertEqual(seen, [])
+        future.set_result(1)
+        self.assertEqual(seen, [future])
+
+    def test_callback_called_immediately_if_done(self):
+        future = Future()
+        future.set_result(1)
+        seen = []
+        future.add_done_callback(seen.append)
+        self.assertEqual(seen, [future])
+
+
+class WorkerPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=3)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_submitted_calls_run(self):
+        futures = [self.pool.submit(lambda x: x * 2, i) for i in range(10)]
+        self.assertEqual([f.result(timeout=5) for f in futures],
+                         [i * 2 for i in range(10)])
+
+    def test_never_exceeds_max_workers(self):
+        release = threading.Event()
+        futures = [self.pool.submit(release.wait, 5) for i in range(10)]
+        self.assertTrue(len(self.pool._threads) <= 3)
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    def test_exceptions_captured_in_future(self):
+        def fail():
+            raise KeyError("missing")
+        future = self.pool.submit(fail)
+        self.assertTrue(isinstance(future.exception(timeout=5), KeyError))
+
+    def test_exit_from_call_resolves_future(self):
+        def exit():
+            raise SystemExit(1)
+        future = self.pool.submit(exit)
+        self.assertTrue(isinstance(future.exception(timeout=5), SystemExit))
+        self.assertEqual(self.pool.submit(lambda: 1).result(timeout=5), 1)
+
+    def test_submit_after_shutdown_raises(self):
+        self.pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(lambda: None)
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            WorkerPool(max_workers=0)
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.results = []
+        self.calls = []
+
+    def call_in_threads(self, func, count):
+        def call():
+            try:
+                self.results.append(self.single_flight.call("key", func))
+            except (ValueError, KeyboardInterrupt) as error:
+                self.results.append(error)
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        wait_until(lambda: len(self.calls) == 1 and
+                   self.single_flight.waiting == count - 1)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_calls_share_result(self):
+        def func():
+            self.calls.append(1)
+            self.release.wait()
+            return "result"
+        self.call_in_threads(func, 5)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(sorted(self.results),
+                         [("result", False)] + [("result", True)] * 4)
+        self.assertEqual(len(self.single_flight), 0)
+
+    def test_concurrent_calls_share_exception(self):
+        error = ValueError("failed")
+
+        def func():
+            self.calls.append(1)
+            self.release.wait()
+            raise error
+        self.call_in_threads(func, 3)
+        self.assertEqual(self.results, [error] * 3)
+
+    def test_interrupted_call_releases_waiters(self):
+        interrupt = KeyboardInterrupt()
+
+        def func():
+            self.calls.append(1)
+            self.release.wait()
+            raise interrupt
+        self.call_in_threads(func, 3)
+        self.assertEqual(self.results, [interrupt] * 3)
+        self.assertEqual(len(self.single_flight), 0)
+
+    def test_sequential_calls_not_shared(self):
+        self.assertEqual(self.single_flight.call("key", lambda: 1), (1, False))
+        self.assertEqual(self.single_flight.call("key", lambda: 2), (2, False))
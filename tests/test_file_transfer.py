@@ -0,0 +1,104 @@
+import StringIO
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+import kazoo
+from kazoo.request_objects import get_body_length
+from tests.stub_server import StubKazooServer
+
+
+class FileTransferTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer().start()
+        self.client = kazoo.Client(api_key="key")
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+        self.temp_dir = tempfile.mkdtemp()
+        self.contents = os.urandom(3 * 1024 * 1024)
+        self.source_path = os.path.join(self.temp_dir, "source")
+        with open(self.source_path, "wb") as source:
+            source.write(self.contents)
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_media_round_trip(self):
+        with open(self.source_path, "rb") as source:
+            self.client.upload_media("acct", "mediaid", source)
+        self.assertEqual(self.stub.get_file("/accounts/acct/media/mediaid/raw"),
+                         ("audio/mpeg", self.contents))
+        output = StringIO.StringIO()
+        response = self.client.download_media("acct", "mediaid", output)
+        self.assertEqual(response.headers["Content-Type"], "audio/mpeg")
+        self.assertEqual(output.getvalue(), self.contents)
+
+    def test_phone_number_doc_round_trip(self):
+        with open(self.source_path, "rb") as source:
+            self.client.upload_phone_number_doc("acct", "+14155551234",
+                                                "form.pdf", source)
+        output = StringIO.StringIO()
+        self.client.download_phone_number_doc("acct", "+14155551234",
+                                              "form.pdf", output)
+        self.assertEqual(output.getvalue(), self.contents)
+
+    def test_upload_resent_in_full_after_token_refresh(self):
+        self.stub.revoke_tokens()
+        with open(self.source_path, "rb") as source:
+            source.seek(1024)
+            self.client.upload_media("acct", "mediaid", source)
+        self.assertEqual(
+            self.stub.get_file("/accounts/acct/media/mediaid/raw")[1],
+            self.contents[1024:])
+
+    def test_parallel_downloads(self):
+        for media_id in ["1", "2", "3"]:
+            self.stub.put_file("/accounts/acct/media/{0}/raw".format(media_id),
+                               "audio/wav", media_id * 100000)
+        outputs = dict((media_id, StringIO.StringIO())
+                       for media_id in ["1", "2", "3"])
+        self.client.map("download_media",
+                        [("acct", media_id, output)
+                         for media_id, output in outputs.items()])
+        for media_id, output in outputs.items():
+            self.assertEqual(output.getvalue(), media_id * 100000)
+
+    def test_missing_download_raises(self):
+        with self.assertRaises(kazoo.exceptions.KazooApiError):
+            self.client.download_voicemail_message("acct", "vmbox", "msg",
+                                                   StringIO.StringIO())
+
+
+class UploadPhoneNumberFileTestCase(unittest.TestCase):
+
+    def test_url_includes_account_and_number(self):
+        client = kazoo.Client(api_key="sdfasdf")
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.post.return_value.status_code = 200
+        client.session.post.return_value.json = {"status": "success"}
+        file_obj = StringIO.StringIO("contents")
+        client.upload_phone_number_file("acctid", "+14155551234", "form.pdf",
+                                        file_obj)
+        client.session.post.assert_called_with(
+            client.BASE_URL + "/accounts/acctid/phone_numbers/+14155551234",
+            headers=mock.ANY, files={"form.pdf": file_obj})
+
+
+class BodyLengthTestCase(unittest.TestCase):
+
+    def test_string(self):
+        self.assertEqual(get_body_length("abc"), 3)
+
+    def test_file_from_current_position(self):
+        body = StringIO.StringIO("abcdef")
+        body.seek(2)
+        self.assertEqual(get_body_length(body), 4)
+        self.assertEqual(body.tell(), 2)
+
+    def test_unseekable(self):
+        self.assertIsNone(get_body_length(iter(["abc"])))
@@ -0,0 +1,66 @@
+import json
+import mock
+import unittest
+import kazoo
+from kazoo.json_codecs import JsonCodec, get_codec
+from tests.stub_server import StubKazooServer
+
+
+class GetCodecTestCase(unittest.TestCase):
+
+    def test_first_importable_module_used(self):
+        codec = get_codec(["no_such_json_module", "json"])
+        self.assertEqual(codec.name, "json")
+
+    def test_falls_back_to_json(self):
+        self.assertIs(get_codec(["no_such_json_module"]).module, json)
+
+
+class DecodeResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = JsonCodec()
+        self.response = mock.Mock()
+
+    def test_decoded(self):
+        self.response.content = '{"status": "success"}'
+        self.assertEqual(self.codec.decode_response(self.response),
+                         {"status": "success"})
+
+    def test_empty_or_invalid_body(self):
+        for content in ["", "<html>Bad Gateway</html>"]:
+            self.response.content = content
+            self.assertIsNone(self.codec.decode_response(self.response))
+
+
+class ClientCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(list_size=3).start()
+        self.module = mock.Mock(__name__="fastjson")
+        self.module.dumps = mock.Mock(side_effect=json.dumps)
+        self.module.loads = mock.Mock(side_effect=json.loads)
+        self.client = kazoo.Client(api_key="key",
+                                   json_codec=JsonCodec(self.module))
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+
+    def test_codec_encodes_and_decodes(self):
+        created = self.client.create_device("acct", {"name": "desk"})
+        self.module.dumps.assert_called_with({"data": {"name": "desk"}})
+        self.assertEqual(created["data"]["name"], "desk")
+        self.assertTrue(self.module.loads.called)
+
+    def test_codec_decodes_streamed_records(self):
+        records = list(self.client.get_account_descendants("acct",
+                                                           stream=True))
+        self.assertEqual(self.module.loads.call_count, len(records))
+
+    def test_error_responses_decoded(self):
+        self.stub.revoke_tokens()
+        self.client.get_device("acct", "deviceid")
+        self.assertEqual(self.stub.auth_count, 2)
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+from kazoo.client import RestClientMetaClass, LazyGeneratedMethod
+from kazoo.rest_resources import RestResource
+
+
+class LazyImportTestCase(unittest.TestCase):
+
+    def test_importing_kazoo_does_not_import_requests(self):
+        output = subprocess.check_output([
+            sys.executable, "-c",
+            "import sys, kazoo; kazoo.Client(api_key='key'); "
+            "print 'requests' in sys.modules"])
+        self.assertEqual(output.strip(), "False")
+
+
+class LazyGeneratedMethodTestCase(unittest.TestCase):
+
+    def setUp(self):
+        class LazyTestClass(object):
+            __metaclass__ = RestClientMetaClass
+            some_resource = RestResource("thing", "/things/{thing_id}")
+
+            def _execute_request(self, request, **kwargs):
+                return request.path
+        self.test_class = LazyTestClass
+
+    def test_methods_not_compiled_until_used(self):
+        self.assertTrue(isinstance(self.test_class.__dict__["get_thing"],
+                                   LazyGeneratedMethod))
+
+    def test_method_compiled_and_cached_on_first_use(self):
+        instance = self.test_class()
+        self.assertEqual(instance.get_thing("x"), "/things/x")
+        self.assertFalse(isinstance(self.test_class.__dict__["get_thing"],
+                                    LazyGeneratedMethod))
+
+    def test_subclass_use_compiles_on_defining_class(self):
+        subclass = type("LazySubclass", (self.test_class,), {})
+        subclass().get_thing("x")
+        self.assertFalse(isinstance(self.test_class.__dict__["get_thing"],
+                                    LazyGeneratedMethod))
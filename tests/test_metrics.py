@@ -0,0 +1,112 @@
+import mock
+import unittest
+from kazoo import Client, exceptions
+from kazoo.metrics import Histogram, MetricsRegistry
+from kazoo.request_objects import KazooRequest
+from kazoo.retry import RetryPolicy
+from kazoo.tracing import RequestTrace
+
+
+class HistogramTestCase(unittest.TestCase):
+
+    def test_percentiles_interpolated_within_buckets(self):
+        histogram = Histogram(buckets=(1, 2, 4))
+        for value in [0.5] * 50 + [3] * 50:
+            histogram.observe(value)
+        self.assertTrue(0 < histogram.percentile(50) <= 1)
+        self.assertAlmostEqual(histogram.percentile(75), 2.5)
+        self.assertAlmostEqual(histogram.percentile(100), 3)
+
+    def test_values_above_last_bucket(self):
+        histogram = Histogram(buckets=(1,))
+        histogram.observe(7)
+        self.assertEqual(histogram.counts, [0, 1])
+        self.assertTrue(1 < histogram.percentile(99) < 7)
+        self.assertEqual(histogram.percentile(100), 7)
+
+    def test_empty_histogram_has_no_percentiles(self):
+        self.assertIsNone(Histogram().percentile(50))
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = [0.0]
+        self.registry = MetricsRegistry(buckets=(0.1, 1))
+
+    def record(self, method_name, duration, error=None, retries=0):
+        trace = RequestTrace(KazooRequest("/accounts/{account_id}"),
+                             method_name, clock=lambda: self.now[0])
+        self.registry.before_request(trace)
+        self.now[0] += duration
+        trace.retries = retries
+        trace.finish(error)
+        self.registry.after_request(trace)
+
+    def test_snapshot(self):
+        self.record("get_account", 0.05)
+        self.record("get_account", 0.5, retries=2,
+                    error=exceptions.KazooApiError("failed"))
+        self.record("get_account", 0.5,
+                    error=exceptions.KazooApiBadDataError({}))
+        stats = self.registry.snapshot()["get_account"]
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["errors"], {"KazooApiError": 1,
+                                           "KazooApiBadDataError": 1})
+        self.assertAlmostEqual(stats["p99"], 0.5, delta=0.01)
+
+    def test_in_flight_gauge(self):
+        trace = RequestTrace(KazooRequest("/accounts/{account_id}"),
+                             "get_account")
+        self.registry.before_request(trace)
+        self.assertEqual(self.registry.snapshot()["get_account"]["in_flight"],
+                         1)
+
+    def test_reset_keeps_requests_in_flight(self):
+        self.record("get_account", 0.5, retries=1,
+                    error=exceptions.KazooApiError("failed"))
+        trace = RequestTrace(KazooRequest("/accounts/{account_id}"),
+                             "get_account", clock=lambda: self.now[0])
+        self.registry.before_request(trace)
+        self.registry.reset()
+        stats = self.registry.snapshot()["get_account"]
+        self.assertEqual((stats["count"], stats["retries"], stats["errors"],
+                          stats["in_flight"]), (0, 0, {}, 1))
+        trace.finish(None)
+        self.registry.after_request(trace)
+        stats = self.registry.snapshot()["get_account"]
+        self.assertEqual((stats["count"], stats["in_flight"]), (1, 0))
+
+    def test_prometheus_text(self):
+        self.record("get_account", 0.05)
+        self.record("get_account", 2, error=exceptions.KazooApiError("x"))
+        lines = self.registry.to_prometheus().splitlines()
+        self.assertIn("# TYPE kazoo_request_duration_seconds histogram",
+                      lines)
+        self.assertIn('kazoo_request_duration_seconds_bucket'
+                      '{method="get_account",le="0.1"} 1', lines)
+        self.assertIn('kazoo_request_duration_seconds_bucket'
+                      '{method="get_account",le="+Inf"} 2', lines)
+        self.assertIn('kazoo_request_duration_seconds_count'
+                      '{method="get_account"} 2', lines)
+        self.assertIn('kazoo_request_errors_total'
+                      '{method="get_account",error="KazooApiError"} 1', lines)
+        self.assertIn('kazoo_requests_in_flight{method="get_account"} 0',
+                      lines)
+
+    def test_client_records_calls_and_retries(self):
+        client = Client(api_key="sdfasdf", metrics=self.registry,
+                        retry_policy=RetryPolicy(sleep=lambda seconds: None))
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        unavailable = mock.Mock(status_code=503, content="", headers={})
+        success = mock.Mock(status_code=200, content="",
+                            json={"status": "success", "data": {}})
+        client.session.get.side_effect = [unavailable, success]
+        client.get_device("acctid", "devid")
+        stats = self.registry.snapshot()["get_device"]
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["errors"], {})
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+import kazoo
+from kazoo.mirror import AccountMirror
+from tests.stub_server import StubKazooServer
+
+
+class AccountMirrorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(list_size=3).start()
+        self.client = kazoo.Client(api_key="key")
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+        self.temp_dir = tempfile.mkdtemp()
+        self.mirror = AccountMirror(self.client,
+                                    os.path.join(self.temp_dir, "mirror.db"),
+                                    max_workers=3)
+
+    def tearDown(self):
+        self.mirror.close()
+        self.client.close()
+        self.stub.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_mirrored_resources(self):
+        resources = self.mirror.get_resources()
+        self.assertIn("callflow", resources)
+        self.assertIn("voicemail_box", resources)
+        self.assertNotIn("account", resources)
+        self.assertNotIn("limit", resources)
+
+    def test_first_sync_fetches_everything(self):
+        report = self.mirror.sync("acct", ["device"])
+        self.assertEqual(report["device"]["fetched"], 3)
+        documents = list(self.mirror.iter_documents("acct", "device"))
+        self.assertEqual(len(documents), 3)
+        self.assertEqual(
+            self.mirror.get_document("acct", "device", documents[0]["id"]),
+            documents[0])
+        self.assertIsNotNone(self.mirror.get_last_sync_time("acct",
+                                                            "device"))
+
+    def test_repeat_sync_only_fetches_changes(self):
+        created = self.client.create_device("acct", {"name": "desk"})
+        device_id = created["data"]["id"]
+        self.client.create_device("acct", {"name": "lobby"})
+        self.mirror.sync("acct", ["device"])
+        self.client.update_device("acct", device_id, {"name": "hall"})
+        report = self.mirror.sync("acct", ["device"])
+        self.assertEqual(report["device"], {"fetched": 1, "unchanged": 1,
+                                            "deleted": 0, "failed": {}})
+        self.assertEqual(
+            self.mirror.get_document("acct", "device", device_id)["name"],
+            "hall")
+
+    def test_deleted_documents_removed(self):
+        created = self.client.create_device("acct", {"name": "desk"})
+        device_id = created["data"]["id"]
+        self.client.create_device("acct", {"name": "lobby"})
+        self.mirror.sync("acct", ["device"])
+        self.client.delete_device("acct", device_id)
+        report = self.mirror.sync("acct", ["device"])
+        self.assertEqual(report["device"]["deleted"], 1)
+        self.assertIsNone(self.mirror.get_document("acct", "device",
+                                                   device_id))
+
+    def test_async_client(self):
+        client = kazoo.AsyncClient(api_key="key")
+        client.BASE_URL = self.stub.base_url
+        client.authenticate()
+        mirror = AccountMirror(client, os.path.join(self.temp_dir, "async.db"))
+        try:
+            self.assertEqual(mirror.sync("acct", ["device"])["device"],
+                             {"fetched": 3, "unchanged": 0, "deleted": 0,
+                              "failed": {}})
+            self.assertEqual(mirror.sync("acct", ["device"])["device"],
+                             {"fetched": 0, "unchanged": 3, "deleted": 0,
+                              "failed": {}})
+        finally:
+            mirror.close()
+            client.close()
+
+    def test_documents_without_revision_stored(self):
+        documents = {"acct": 0}
+
+        def fetch(account_id, resource, object_id, revision):
+            documents["acct"] += 1
+            return {"data": {"id": object_id, "version": documents["acct"]},
+                    "revision": "undefined"}
+        self.mirror._fetch_document = fetch
+        report = self.mirror.sync("acct", ["device"])
+        self.assertEqual(report["device"]["fetched"], 3)
+        device_id = self.mirror.get_revisions("acct", "device").keys()[0]
+        self.assertIsNotNone(self.mirror.get_document("acct", "device",
+                                                      device_id))
+        report = self.mirror.sync("acct", ["device"])
+        self.assertEqual(report["device"]["fetched"], 3)
+        self.assertGreater(self.mirror.get_document(
+            "acct", "device", device_id)["version"], 3)
@@ -0,0 +1,84 @@
+import mock
+import unittest
+from kazoo import Client, AsyncClient
+from kazoo.executor import Future
+from kazoo.paging import iter_pages, encode_start_key
+
+
+def completed(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class IterPagesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = {
+            None: {"data": [1, 2], "next_start_key": "b"},
+            "b": {"data": [3, 4], "next_start_key": "c"},
+            "c": {"data": [5]},
+        }
+
+    def test_records_from_all_pages_yielded(self):
+        records = list(iter_pages(lambda key: key,
+                                  lambda key: completed(self.pages[key])))
+        self.assertEqual(records, [1, 2, 3, 4, 5])
+
+    def test_next_page_requested_before_records_yielded(self):
+        requested = []
+
+        def submit(key):
+            requested.append(key)
+            return completed(self.pages[key])
+        records = iter_pages(lambda key: key, submit)
+        self.assertEqual(next(records), 1)
+        self.assertEqual(requested, [None, "b"])
+
+    def test_submitted_first_page_not_requested_again(self):
+        requested = []
+
+        def submit(key):
+            requested.append(key)
+            return completed(self.pages[key])
+        records = list(iter_pages(lambda key: key, submit,
+                                  completed(self.pages[None])))
+        self.assertEqual(records, [1, 2, 3, 4, 5])
+        self.assertEqual(requested, ["b", "c"])
+
+    def test_compound_start_keys_json_encoded(self):
+        self.assertEqual(encode_start_key("somekey"), "somekey")
+        self.assertEqual(encode_start_key(["a", 1]), '["a", 1]')
+
+
+class ClientListIteratorTestCase(unittest.TestCase):
+
+    def fake_get(self, url, headers=None):
+        response = mock.Mock()
+        response.status_code = 200
+        if "start_key=" in url:
+            response.json = {"status": "success", "data": [{"id": "2"}]}
+        else:
+            response.json = {"status": "success", "data": [{"id": "1"}],
+                             "next_start_key": "2"}
+        return response
+
+    def assert_iterates_pages(self, client):
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.get.side_effect = self.fake_get
+        records = list(client.iter_callflows("acctid", page_size=1))
+        self.assertEqual(records, [{"id": "1"}, {"id": "2"}])
+        urls = [args[0] for args, _ in client.session.get.call_args_list]
+        self.assertTrue("page_size=1" in urls[0])
+        self.assertTrue("start_key=2" in urls[1])
+
+    def test_client_iterates_pages(self):
+        self.assert_iterates_pages(Client(api_key="sdfasdf"))
+
+    def test_async_client_iterates_pages(self):
+        client = AsyncClient(api_key="sdfasdf")
+        try:
+            self.assert_iterates_pages(client)
+        finally:
+            client.close()
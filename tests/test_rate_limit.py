@@ -0,0 +1,90 @@
+import mock
+import unittest
+from kazoo import Client
+from kazoo.rate_limit import TokenBucket, RateLimiter
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.bucket = TokenBucket(2, burst=3, clock=self.time.clock,
+                                  sleep=self.time.sleep)
+
+    def test_burst_allowed_without_waiting(self):
+        for _ in range(3):
+            self.bucket.acquire()
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_waits_queue_at_rate_once_burst_used(self):
+        for _ in range(5):
+            self.bucket.acquire()
+        self.assertEqual(self.time.sleeps, [0.5, 1.0])
+
+    def test_tokens_refill_over_time(self):
+        for _ in range(3):
+            self.bucket.acquire()
+        self.time.now += 1
+        self.bucket.acquire()
+        self.bucket.acquire()
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_refill_capped_at_burst(self):
+        self.time.now += 100
+        for _ in range(4):
+            self.bucket.acquire()
+        self.assertEqual(self.time.sleeps, [0.5])
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+
+    def create_limiter(self, **kwargs):
+        return RateLimiter(clock=self.time.clock, sleep=self.time.sleep,
+                           **kwargs)
+
+    def test_method_buckets_separate(self):
+        limiter = self.create_limiter(method_limits={"put": (1, 1)})
+        limiter.acquire("put")
+        limiter.acquire("get")
+        self.assertEqual(self.time.sleeps, [])
+        limiter.acquire("PUT")
+        self.assertEqual(self.time.sleeps, [1.0])
+
+    def test_resource_and_global_buckets_both_apply(self):
+        limiter = self.create_limiter(rate=10, burst=1,
+                                      resource_limits={"device": (1, 1)})
+        limiter.acquire("get", "device")
+        self.time.now += 0.1
+        limiter.acquire("get", "device")
+        self.assertEqual(len(self.time.sleeps), 1)
+        self.assertAlmostEqual(self.time.sleeps[0], 0.9)
+
+    def test_client_acquires_before_each_request(self):
+        limiter = mock.Mock()
+        client = Client(api_key="sdfasdf", rate_limiter=limiter)
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.post.return_value.status_code = 200
+        client.session.post.return_value.json = {"status": "success"}
+        client.update_device("acctid", "devid", {"name": "dev"})
+        limiter.acquire.assert_called_with("post", "device")
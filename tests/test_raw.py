@@ -0,0 +1,106 @@
+import json
+import mock
+import unittest
+from kazoo import Client, exceptions
+from kazoo.cache import ResponseCache
+from kazoo.request_objects import KazooRequest, RawResponse
+from tests.stub_server import StubKazooServer
+from tests.utils import make_response
+
+
+class RawRequestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.request = KazooRequest("/somepath", auth_required=False)
+        self.session = mock.Mock()
+
+    def execute(self, status_code, body, **kwargs):
+        self.response = make_response(status_code, body)
+        self.session.get.return_value = self.response
+        return self.request.execute("http://testserver",
+                                    session=self.session, raw=True, **kwargs)
+
+    def test_returns_undecoded_body(self):
+        body = {"status": "success", "data": {"id": "1"}}
+        response = self.execute(200, body)
+        self.assertTrue(isinstance(response, RawResponse))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), body)
+        self.assertFalse(self.response.decode.called)
+
+    def test_error_status_in_body_raised(self):
+        with self.assertRaises(exceptions.KazooApiError):
+            self.execute(200, {"status": "error", "error": "404",
+                               "message": "not found", "request_id": "id"})
+
+    def test_nested_error_status_not_mistaken_for_error(self):
+        response = self.execute(200, {"status": "success",
+                                      "data": {"status": "error"}})
+        self.assertEqual(response.status_code, 200)
+
+    def test_server_error_raised(self):
+        with self.assertRaises(exceptions.KazooApiUnavailableError):
+            self.execute(500, {"data": "crashed"})
+
+    def test_stream_left_unread(self):
+        response = self.execute(200, {"status": "success", "data": []},
+                                stream=True)
+        self.assertEqual("".join(response.iter_content(10)),
+                         self.response.content)
+        self.session.get.assert_called_with("http://testserver/somepath",
+                                            headers=mock.ANY, prefetch=False)
+
+    def test_streamed_error_raised(self):
+        with self.assertRaises(exceptions.KazooApiBadDataError):
+            self.execute(400, {"status": "error", "error": "400",
+                               "message": "invalid", "request_id": "id",
+                               "data": {"name": "required"}}, stream=True)
+
+
+class RawClientTestCase(unittest.TestCase):
+
+    def test_raw_requests_bypass_cache(self):
+        client = Client(api_key="sdfasdf", cache=ResponseCache())
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        client.session.get.return_value = make_response()
+        client.get_callflow("acctid", "cfid", raw=True)
+        client.get_callflow("acctid", "cfid", raw=True)
+        self.assertEqual(client.session.get.call_count, 2)
+        self.assertEqual(len(client.cache), 0)
+
+
+class CompressedRawResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(list_size=20,
+                                    compress_responses=True).start()
+        self.client = Client(api_key="key")
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+
+    def test_encoding_headers_dropped_from_decoded_body(self):
+        for stream in [False, True]:
+            response = self.client.get_callflows("acct", raw=True,
+                                                 stream=stream)
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertNotIn("Content-Length", response.headers)
+            self.assertEqual(response.headers["Content-Type"],
+                             "application/json")
+            body = "".join(response.iter_content()) if stream else \
+                response.content
+            self.assertEqual(len(json.loads(body)["data"]), 20)
+
+    def test_uncompressed_headers_kept(self):
+        self.client.close()
+        self.client = Client(api_key="key", accept_encoding="identity")
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+        response = self.client.get_callflows("acct", raw=True)
+        self.assertEqual(int(response.headers["Content-Length"]),
+                         len(response.content))
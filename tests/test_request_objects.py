@@ -1,7 +1,7 @@
 import json
 from kazoo import exceptions
 from kazoo.request_objects import KazooRequest, UsernamePasswordAuthRequest, \
-    ApiKeyAuthRequest
+    ApiKeyAuthRequest, RequestTemplate
 import mock
 import unittest
 from tests import utils
@@ -179,6 +179,55 @@ class GetParametersTestCase(RequestTestCase):
 
 
 
+class ConditionalRequestTestCase(RequestTestCase):
+
+    def test_not_modified_returns_none(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        with mock.patch('requests.get') as mock_get:
+            mock_get.return_value.status_code = 304
+            response = request.execute("http://testserver.com",
+                                       if_none_match='"1-abc"')
+            self.assertEqual(response, None)
+            headers = mock_get.call_args[1]["headers"]
+            self.assertEqual(headers["If-None-Match"], '"1-abc"')
+
+
+class RequestTemplateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.template = RequestTemplate.compile(
+            "/accounts/{account_id}/things/{thing_id}", "post",
+            resource_name="thing",
+            collection_path="/accounts/{account_id}/things")
+
+    def test_render_formats_path_and_collection(self):
+        request = self.template.render({"account_id": "a", "thing_id": "b"})
+        self.assertEqual(request.path, "/accounts/a/things/b")
+        self.assertEqual(request.collection_path, "/accounts/a/things")
+        self.assertEqual(request.method, "post")
+        self.assertEqual(request.resource_name, "thing")
+
+    def test_rendered_request_needs_no_params(self):
+        request = self.template.render({"account_id": "a", "thing_id": "b"})
+        with mock.patch('requests.post') as mock_post:
+            mock_post.return_value.json = {"status": "success"}
+            request.execute("http://testserver", token="sometoken")
+            mock_post.assert_called_with(
+                "http://testserver/accounts/a/things/b", headers=mock.ANY)
+
+    def test_missing_param_raises(self):
+        with self.assertRaises(KeyError):
+            self.template.render({"account_id": "a"})
+
+    def test_percent_signs_in_path_preserved(self):
+        template = RequestTemplate.compile("/100%/{thing_id}", "get")
+        self.assertEqual(template.render({"thing_id": "x"}).path, "/100%/x")
+
+    def test_templates_are_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.template.path = "/other"
+
+
 class UsernamePasswordAuthRequestTestCase(RequestTestCase):
 
     def setUp(self):
@@ -31,6 +31,12 @@ class RestResourceTestCase(unittest.TestCase):
         request = self.resource.get_list_request(argument1=1)
         self.assertEqual(request.path, "/1/subresource")
 
+    def test_resource_list_method_with_get_params(self):
+        request = self.resource.get_list_request(
+            argument1=1, get_params={"page_size": 10})
+        self.assertEqual(request.path, "/1/subresource")
+        self.assertEqual(request.get_params, {"page_size": 10})
+
     def test_resource_individual_method_hits_correct_url(self):
         request = self.resource.get_object_request(argument1=1, argument2=2)
         self.assertEqual(request.path, "/1/subresource/2")
@@ -130,7 +136,10 @@ class RestResourceMethodNameTestCase(unittest.TestCase):
                           "object": "get_someresource",
                           "update": "update_someresource",
                           "create": "create_someresource",
-                          "delete": "delete_someresource"}
+                          "delete": "delete_someresource",
+                          "bulk_create": "create_someresources",
+                          "bulk_update": "update_someresources",
+                          "bulk_delete": "delete_someresources"}
         self.assertEqual(expected_names, method_names)
 
     def test_custom_resource_names(self):
@@ -138,7 +147,10 @@ class RestResourceMethodNameTestCase(unittest.TestCase):
                       "object": "get_book",
                       "update": "update_book",
                       "create": "create_book",
-                      "delete": "delete_book"}
+                      "delete": "delete_book",
+                      "bulk_create": "create_books",
+                      "bulk_update": "update_books",
+                      "bulk_delete": "delete_books"}
         resource = RestResource("someresource", "/someplace/{resource_id}",
                                 method_names=method_names)
         self.assertEqual(resource.method_names, method_names)
@@ -151,7 +163,10 @@ class RestResourceMethodNameTestCase(unittest.TestCase):
         expected_names.update({
             "object": "get_someresource",
             "update": "update_someresource",
-            "delete": "delete_someresource"
+            "delete": "delete_someresource",
+            "bulk_create": "create_someresources",
+            "bulk_update": "update_someresources",
+            "bulk_delete": "delete_someresources"
         })
         self.assertEqual(expected_names, resource.method_names)
 
@@ -0,0 +1,152 @@
+import mock
+import requests
+import unittest
+from kazoo import Client, exceptions
+from kazoo.request_objects import KazooRequest
+from kazoo.retry import RetryPolicy, CircuitBreaker
+from tests.utils import FakeClock, make_response
+
+
+def unavailable_response(retry_after=None):
+    headers = {}
+    if retry_after is not None:
+        headers["Retry-After"] = str(retry_after)
+    return make_response(503, headers=headers)
+
+
+class UnavailableResponseTestCase(unittest.TestCase):
+
+    def test_unavailable_status_raises_with_retry_after(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        with mock.patch('requests.get') as mock_get:
+            mock_get.return_value = unavailable_response(retry_after=7)
+            with self.assertRaises(exceptions.KazooApiUnavailableError) as cm:
+                request.execute("http://testserver")
+        self.assertEqual(cm.exception.status_code, 503)
+        self.assertEqual(cm.exception.retry_after, 7)
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy(method_retries={"get": 2},
+                                  backoff_factor=1, max_backoff=5,
+                                  random=lambda: 0.5)
+        self.error = exceptions.KazooApiUnavailableError("down")
+
+    def test_retries_limited_per_method(self):
+        self.assertTrue(self.policy.should_retry("get", 1, self.error))
+        self.assertFalse(self.policy.should_retry("get", 2, self.error))
+        self.assertFalse(self.policy.should_retry("put", 0, self.error))
+
+    def test_default_only_retries_safe_methods(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.should_retry("delete", 0, self.error))
+        self.assertFalse(policy.should_retry("post", 0, self.error))
+
+    def test_open_circuit_not_retried(self):
+        error = exceptions.CircuitOpenError("open")
+        self.assertFalse(self.policy.should_retry("get", 0, error))
+
+    def test_backoff_exponential_with_jitter_and_cap(self):
+        self.assertEqual(self.policy.get_backoff(0, self.error), 0.5)
+        self.assertEqual(self.policy.get_backoff(2, self.error), 2)
+        self.assertEqual(self.policy.get_backoff(10, self.error), 2.5)
+
+    def test_retry_after_honored(self):
+        error = exceptions.KazooApiUnavailableError("down", retry_after=9)
+        self.assertEqual(self.policy.get_backoff(0, error), 9)
+
+    def test_long_retry_after_not_retried(self):
+        error = exceptions.KazooApiUnavailableError("down", retry_after=3600)
+        self.assertFalse(self.policy.should_retry("get", 0, error))
+        self.assertEqual(self.policy.get_backoff(0, error), 60)
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10,
+                                      clock=self.clock)
+
+    def open_circuit(self):
+        self.breaker.record_failure("host")
+        self.breaker.record_failure("host")
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure("host")
+        self.breaker.before_request("host")
+        self.breaker.record_failure("host")
+        with self.assertRaises(exceptions.CircuitOpenError):
+            self.breaker.before_request("host")
+
+    def test_hosts_tracked_separately(self):
+        self.open_circuit()
+        self.breaker.before_request("otherhost")
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure("host")
+        self.breaker.record_success("host")
+        self.breaker.record_failure("host")
+        self.assertFalse(self.breaker.is_open("host"))
+
+    def test_single_trial_after_reset_timeout(self):
+        self.open_circuit()
+        self.clock.now += 11
+        self.breaker.before_request("host")
+        with self.assertRaises(exceptions.CircuitOpenError):
+            self.breaker.before_request("host")
+        self.breaker.record_success("host")
+        self.breaker.before_request("host")
+
+    def test_failed_trial_reopens(self):
+        self.open_circuit()
+        self.clock.now += 11
+        self.breaker.before_request("host")
+        self.breaker.record_failure("host")
+        with self.assertRaises(exceptions.CircuitOpenError):
+            self.breaker.before_request("host")
+
+
+class ClientRetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.sleeps = []
+        self.client = Client(
+            api_key="sdfasdf",
+            retry_policy=RetryPolicy(method_retries={"get": 2},
+                                     sleep=self.sleeps.append,
+                                     random=lambda: 1),
+            circuit_breaker=CircuitBreaker(failure_threshold=3))
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+
+    def test_retried_until_success(self):
+        self.client.session.get.side_effect = [
+            unavailable_response(),
+            requests.exceptions.ConnectionError("refused"),
+            make_response()]
+        response = self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(self.sleeps, [0.1, 0.2])
+
+    def test_error_raised_when_retries_exhausted(self):
+        self.client.session.get.return_value = unavailable_response()
+        with self.assertRaises(exceptions.KazooApiUnavailableError):
+            self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(self.client.session.get.call_count, 3)
+
+    def test_circuit_opens_and_fails_fast(self):
+        self.client.session.get.return_value = unavailable_response()
+        with self.assertRaises(exceptions.KazooApiUnavailableError):
+            self.client.get_callflow("acctid", "cfid")
+        with self.assertRaises(exceptions.CircuitOpenError):
+            self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(self.client.session.get.call_count, 3)
+
+    def test_non_idempotent_method_not_retried(self):
+        self.client.session.put.return_value = unavailable_response()
+        with self.assertRaises(exceptions.KazooApiUnavailableError):
+            self.client.create_callflow("acctid", {"name": "cf"})
+        self.assertEqual(self.client.session.put.call_count, 1)
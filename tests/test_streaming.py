@@ -0,0 +1,107 @@
+import json
+import mock
+import unittest
+from kazoo import Client, exceptions
+from kazoo.request_objects import KazooRequest
+from kazoo.streaming import StreamingArrayParser
+from tests.utils import make_response
+
+
+def feed_in_chunks(parser, document, chunk_size):
+    items = []
+    for start in range(0, len(document), chunk_size):
+        items.extend(parser.feed(document[start:start + chunk_size]))
+    return items
+
+
+class StreamingArrayParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {"id": "1", "name": "with \"quotes\" and , [brackets]"},
+            {"id": "2", "nested": {"list": [1, 2, {"a": "}"}]}},
+            "a string",
+            12.5,
+            None,
+            [],
+        ]
+        self.document = json.dumps({
+            "auth_token": "sometoken",
+            "data": self.records,
+            "revision": "undefined",
+            "status": "success",
+        })
+
+    def test_elements_decoded_with_any_chunk_size(self):
+        for chunk_size in [1, 2, 3, 7, 64, len(self.document)]:
+            parser = StreamingArrayParser()
+            self.assertEqual(
+                feed_in_chunks(parser, self.document, chunk_size),
+                self.records)
+
+    def test_envelope_strings_collected(self):
+        parser = StreamingArrayParser()
+        feed_in_chunks(parser, self.document, 5)
+        self.assertEqual(parser.envelope["status"], "success")
+        self.assertEqual(parser.envelope["auth_token"], "sometoken")
+
+    def test_escaped_characters_in_keys_across_chunks(self):
+        document = '{"da\\u0074a": ["x\\\\", "y"], "status": "success"}'
+        for chunk_size in [1, 2, 3]:
+            parser = StreamingArrayParser()
+            self.assertEqual(feed_in_chunks(parser, document, chunk_size),
+                             ["x\\", "y"])
+
+    def test_nested_data_keys_ignored(self):
+        document = json.dumps({"other": {"data": [1, 2]}, "data": [3]})
+        parser = StreamingArrayParser()
+        self.assertEqual(parser.feed(document), [3])
+
+    def test_empty_array(self):
+        parser = StreamingArrayParser()
+        self.assertEqual(parser.feed('{"data": [ ], "status": "success"}'),
+                         [])
+
+
+class StreamingRequestTestCase(unittest.TestCase):
+
+    def test_stream_returns_records_iterator(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        body = {"data": [{"id": "1"}, {"id": "2"}], "status": "success"}
+        session = mock.Mock()
+        session.get.return_value = make_response(200, body)
+        records = request.execute("http://testserver", session=session,
+                                  stream=True)
+        self.assertEqual(list(records), [{"id": "1"}, {"id": "2"}])
+        session.get.assert_called_with("http://testserver/somepath",
+                                       headers=mock.ANY, prefetch=False)
+
+    def test_error_status_handled_without_streaming(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        body = {"status": "error", "error": "404", "message": "not found",
+                "request_id": "someid"}
+        session = mock.Mock()
+        session.get.return_value = make_response(404, body)
+        with self.assertRaises(exceptions.KazooApiError):
+            request.execute("http://testserver", session=session,
+                            stream=True)
+
+    def test_error_envelope_raised_after_stream(self):
+        request = KazooRequest("/somepath", auth_required=False)
+        body = {"status": "error", "error": "503", "message": "unavailable",
+                "request_id": "someid"}
+        session = mock.Mock()
+        session.get.return_value = make_response(200, body)
+        records = request.execute("http://testserver", session=session,
+                                  stream=True)
+        with self.assertRaises(exceptions.KazooApiError):
+            list(records)
+
+    def test_generated_methods_accept_stream_option(self):
+        client = Client(api_key="sdfasdf")
+        client.auth_token = "sometoken"
+        client.session = mock.Mock()
+        body = {"data": [{"id": "child"}], "status": "success"}
+        client.session.get.return_value = make_response(200, body)
+        records = client.get_account_descendants("acctid", stream=True)
+        self.assertEqual(list(records), [{"id": "child"}])
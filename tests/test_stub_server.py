@@ -0,0 +1,41 @@
+import unittest
+import kazoo
+from tests.stub_server import StubKazooServer
+
+
+class StubServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(list_size=5, descendants_size=20).start()
+        self.client = kazoo.Client(api_key="key")
+        self.client.BASE_URL = self.stub.base_url
+        self.client.authenticate()
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+
+    def test_detail_request_returns_generated_document(self):
+        response = self.client.get_callflow("acct", "cfid")
+        self.assertEqual(response["data"]["id"], "cfid")
+
+    def test_list_and_descendants_sizes(self):
+        self.assertEqual(len(self.client.get_callflows("acct")["data"]), 5)
+        descendants = self.client.get_account_descendants("acct")
+        self.assertEqual(len(descendants["data"]), 20)
+
+    def test_written_documents_are_listed(self):
+        created = self.client.create_device("acct", {"name": "phone"})
+        device_id = created["data"]["id"]
+        self.client.update_device("acct", device_id, {"name": "desk"})
+        response = self.client.get_device("acct", device_id)
+        self.assertEqual(response["data"]["name"], "desk")
+        self.assertEqual(response["revision"][:2], "2-")
+        self.assertEqual(self.client.get_devices("acct")["data"],
+                         [response["data"]])
+
+    def test_revoked_token_is_refreshed(self):
+        self.stub.revoke_tokens()
+        response = self.client.get_callflow("acct", "cfid")
+        self.assertEqual(response["data"]["id"], "cfid")
+        self.assertEqual(self.stub.auth_count, 2)
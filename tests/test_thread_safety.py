@@ -0,0 +1,70 @@
+import sys
+import threading
+import unittest
+import kazoo
+from tests.stub_server import StubKazooServer
+
+THREADS = 16
+CALLS_PER_THREAD = 10
+PHASES = 3
+
+
+class SharedClientStressTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.stub = StubKazooServer(
+            list_size=5, set_cookie="SERVERID=node1; Path=/").start()
+        self.client = kazoo.Client(api_key="key", pool_maxsize=THREADS)
+        self.client.BASE_URL = self.stub.base_url
+        self.errors = []
+
+    def tearDown(self):
+        self.client.close()
+        self.stub.stop()
+
+    def run_threads(self, target):
+        def run(thread_index):
+            try:
+                target(thread_index)
+            except Exception:
+                self.errors.append(sys.exc_info())
+        threads = [threading.Thread(target=run, args=(index,))
+                   for index in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0][0], self.errors[0][1], self.errors[0][2]
+
+    def test_concurrent_authenticate_makes_one_request(self):
+        tokens = []
+        self.run_threads(lambda index: tokens.append(
+            self.client.authenticate()))
+        self.assertEqual(self.stub.auth_count, 1)
+        self.assertEqual(set(tokens), set([self.client.auth_token]))
+
+    def test_shared_client_under_load(self):
+        def work(thread_index):
+            self.client.authenticate()
+            device_id = "device{0}".format(thread_index)
+            for call in range(CALLS_PER_THREAD):
+                name = "{0} {1}".format(thread_index, call)
+                self.client.update_device("acct", device_id, {"name": name})
+                device = self.client.get_device("acct", device_id)
+                self.assertEqual(device["data"]["name"], name)
+                self.assertEqual(
+                    len(self.client.get_callflows("acct")["data"]), 5)
+        for phase in range(PHASES):
+            if phase:
+                # Every thread has the same token refused at once
+                self.stub.revoke_tokens()
+            self.run_threads(work)
+        self.assertEqual(self.stub.auth_count, PHASES)
+        # The session must not be written to by requests
+        self.assertEqual(len(self.client.session.cookies), 0)
+        # At most one refused request per thread after each revocation,
+        # threads starting after the refresh use the new token straight away
+        calls = PHASES + PHASES * THREADS * CALLS_PER_THREAD * 3
+        self.assertTrue(calls <= self.stub.request_count <=
+                        calls + (PHASES - 1) * THREADS)
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import threading
+import mock
+import unittest
+from kazoo import Client, exceptions
+from kazoo.token_stores import MemoryTokenStore, FileTokenStore, \
+    DbmTokenStore
+from tests.utils import make_response
+
+
+def auth_error_response():
+    return make_response(401, {"status": "error", "error": "401",
+                               "message": "invalid credentials",
+                               "request_id": "id"})
+
+
+class TokenRefreshTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(api_key="sdfasdf")
+        self.client.auth_request = mock.Mock()
+        self.tokens = iter(["token1", "token2", "token3"])
+        self.client.auth_request.execute.side_effect = \
+            lambda *args, **kwargs: {"auth_token": next(self.tokens)}
+        self.client.authenticate()
+        self.client.session = mock.Mock()
+
+    def fake_get(self, url, headers=None):
+        if headers["X-Auth-Token"] == "token1":
+            return auth_error_response()
+        return make_response()
+
+    def test_expired_token_refreshed_and_request_retried(self):
+        self.client.session.get.side_effect = self.fake_get
+        response = self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(self.client.auth_token, "token2")
+
+    def test_second_rejection_raised(self):
+        self.client.session.get.return_value = auth_error_response()
+        with self.assertRaises(exceptions.KazooApiAuthenticationError):
+            self.client.get_callflow("acctid", "cfid")
+        self.assertEqual(self.client.auth_request.execute.call_count, 2)
+
+    def test_only_one_refresh_for_concurrent_rejections(self):
+        all_rejected = threading.Event()
+        calls = []
+
+        def fake_get(url, headers=None):
+            calls.append(headers["X-Auth-Token"])
+            if headers["X-Auth-Token"] == "token1":
+                if len(calls) == 5:
+                    all_rejected.set()
+                all_rejected.wait(5)
+                return auth_error_response()
+            return make_response()
+        self.client.session.get.side_effect = fake_get
+        results = self.client.map("get_callflow",
+                                  [("acctid", str(i)) for i in range(5)],
+                                  max_workers=5)
+        self.assertEqual([r["status"] for r in results], ["success"] * 5)
+        self.assertEqual(self.client.auth_request.execute.call_count, 2)
+
+
+class TokenStoreClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.store = MemoryTokenStore()
+
+    def create_client(self):
+        client = Client(api_key="sdfasdf", token_store=self.store)
+        client.auth_request = mock.Mock(wraps=client.auth_request)
+        client.auth_request.execute = mock.Mock(
+            return_value={"auth_token": "sharedtoken"})
+        return client
+
+    def test_stored_token_reused_by_new_client(self):
+        first = self.create_client()
+        first.authenticate()
+        second = self.create_client()
+        self.assertEqual(second.authenticate(), "sharedtoken")
+        self.assertFalse(second.auth_request.execute.called)
+
+    def test_rejected_token_removed_from_store(self):
+        client = self.create_client()
+        client.authenticate()
+        client.auth_request.execute.return_value = {"auth_token": "newtoken"}
+        client._refresh_auth_token("sharedtoken")
+        key = client._get_token_store_key()
+        self.assertEqual(self.store.get(key), {"auth_token": "newtoken"})
+
+    def test_token_replaced_by_another_process_used(self):
+        client = self.create_client()
+        client.authenticate()
+        key = client._get_token_store_key()
+        self.store.set(key, {"auth_token": "othertoken"})
+        self.assertEqual(client._refresh_auth_token("sharedtoken"),
+                         "othertoken")
+        self.assertEqual(client.auth_request.execute.call_count, 1)
+        self.assertEqual(self.store.get(key), {"auth_token": "othertoken"})
+
+    def test_different_credentials_use_different_keys(self):
+        first = Client(api_key="one")
+        second = Client(api_key="two")
+        self.assertNotEqual(first._get_token_store_key(),
+                            second._get_token_store_key())
+
+
+class PersistentTokenStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assert_store_round_trips(self, create_store):
+        create_store().set("somekey", {"auth_token": "sometoken"})
+        store = create_store()
+        self.assertEqual(store.get("somekey"), {"auth_token": "sometoken"})
+        store.delete("somekey")
+        self.assertEqual(create_store().get("somekey"), None)
+
+    def test_file_token_store(self):
+        path = os.path.join(self.directory, "tokens.json")
+        self.assert_store_round_trips(lambda: FileTokenStore(path))
+
+    def test_dbm_token_store(self):
+        path = os.path.join(self.directory, "tokens.db")
+        self.assert_store_round_trips(lambda: DbmTokenStore(path))
+
+    def test_missing_key_returns_none(self):
+        path = os.path.join(self.directory, "missing.json")
+        self.assertEqual(FileTokenStore(path).get("somekey"), None)
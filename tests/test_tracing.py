@@ -0,0 +1,111 @@
+import json
+import logging
+import mock
+import unittest
+from kazoo import Client, exceptions
+from kazoo.request_objects import KazooRequest
+from kazoo.tracing import RequestTrace, LoggingRequestHook
+from tests.utils import make_response
+
+
+class RecordingHook(object):
+
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, trace):
+        self.events.append(("before", trace.status_code))
+
+    def after_request(self, trace):
+        self.events.append(("after", trace))
+
+
+class RequestHookTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingHook()
+        self.client = Client(api_key="sdfasdf", request_hooks=[self.hook])
+        self.client.auth_token = "sometoken"
+        self.client.session = mock.Mock()
+        self.body = {"status": "success", "data": {"id": "devid"}}
+
+    def respond(self, status_code, body):
+        def request(url, headers=None, hooks=None, **kwargs):
+            response = make_response(status_code, body)
+            hooks["response"](response)
+            return response
+        return request
+
+    def test_trace_describes_request(self):
+        self.client.session.post.side_effect = self.respond(200, self.body)
+        self.client.update_device("acctid", "devid", {"name": "dev"})
+        self.assertEqual(self.hook.events[0], ("before", None))
+        trace = self.hook.events[1][1]
+        self.assertEqual(trace.method_name, "update_device")
+        self.assertEqual(trace.resource_name, "device")
+        self.assertEqual(trace.http_method, "post")
+        self.assertEqual(trace.url_template,
+                         "/accounts/{account_id}/devices/{device_id}")
+        self.assertEqual(trace.url, Client.BASE_URL +
+                         "/accounts/acctid/devices/devid")
+        self.assertEqual(trace.status_code, 200)
+        self.assertEqual(trace.bytes_sent,
+                         len(json.dumps({"data": {"name": "dev"}})))
+        self.assertEqual(trace.bytes_received, len(json.dumps(self.body)))
+        self.assertEqual(trace.attempts, 1)
+        self.assertIsNone(trace.error)
+        self.assertGreaterEqual(trace.duration, trace.wait_time)
+
+    def test_failed_request_traced(self):
+        error_body = {"status": "error", "error": "404", "message": "nope",
+                      "request_id": "id"}
+        self.client.session.get.side_effect = self.respond(404, error_body)
+        with self.assertRaises(exceptions.KazooApiError):
+            self.client.get_device("acctid", "devid")
+        trace = self.hook.events[1][1]
+        self.assertEqual(trace.status_code, 404)
+        self.assertIsInstance(trace.error, exceptions.KazooApiError)
+
+    def test_iterator_pages_traced_with_method_name(self):
+        page = {"status": "success", "data": [{"id": "1"}]}
+        self.client.session.get.side_effect = self.respond(200, page)
+        list(self.client.iter_devices("acctid"))
+        trace = self.hook.events[1][1]
+        self.assertEqual(trace.method_name, "iter_devices")
+        self.assertEqual(trace.url_template,
+                         "/accounts/{account_id}/devices")
+
+    def test_no_hooks_passed_to_session_without_request_hooks(self):
+        self.client.request_hooks = []
+        self.client.session.get.return_value = make_response(200, self.body)
+        self.client.get_device("acctid", "devid")
+        self.assertNotIn("hooks", self.client.session.get.call_args[1])
+
+
+class LoggingRequestHookTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = mock.Mock()
+        self.logger.isEnabledFor.return_value = True
+        self.trace = RequestTrace(KazooRequest("/accounts/{account_id}"),
+                                  "get_account", clock=lambda: 10.0)
+
+    def test_slow_request_logged_as_warning(self):
+        hook = LoggingRequestHook(slow_threshold=1.0, logger=self.logger)
+        self.trace._clock = lambda: 12.0
+        self.trace.finish()
+        hook.after_request(self.trace)
+        self.assertEqual(self.logger.log.call_args[0][0], logging.WARNING)
+
+    def test_fast_request_logged_as_debug(self):
+        hook = LoggingRequestHook(slow_threshold=1.0, logger=self.logger)
+        self.trace.finish()
+        hook.after_request(self.trace)
+        self.assertEqual(self.logger.log.call_args[0][0], logging.DEBUG)
+
+    def test_nothing_formatted_when_level_disabled(self):
+        self.logger.isEnabledFor.return_value = False
+        hook = LoggingRequestHook(logger=self.logger)
+        self.trace.finish()
+        hook.after_request(self.trace)
+        self.assertFalse(self.logger.log.called)
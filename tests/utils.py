@@ -1,5 +1,7 @@
 import json
+import mock
 import os.path as path
+import time
 
 
 def load_fixture(filename):
@@ -11,3 +13,44 @@ def load_fixture(filename):
 def load_fixture_as_dict(json_filename):
     raw = load_fixture(json_filename)
     return json.loads(raw)
+
+
+def wait_until(condition, timeout=5):
+    """Poll until condition() is true, failing if it takes longer than
+    timeout seconds
+    """
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.001)
+
+
+class FakeClock(object):
+    """A clock which only moves when the test sets now"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code=200, body=None, headers=None):
+    """A mock requests response whose json is body, by default a successful
+    envelope, and whose content is body encoded, also returned in two chunks
+    by iter_content. Reads of json are recorded by response.decode.
+    """
+    if body is None:
+        body = {"status": "success", "data": {}}
+    content = json.dumps(body)
+    response = mock.Mock()
+    response.status_code = status_code
+    response.headers = {"Content-Type": "application/json",
+                        "X-Request-Id": "someid"}
+    response.headers.update(headers or {})
+    response.content = content
+    response.iter_content.return_value = [content[:10], content[10:]]
+    response.decode = mock.PropertyMock(return_value=body)
+    type(response).json = response.decode
+    return response